@@ -3,148 +3,444 @@
 Debug script to troubleshoot favorites collection issues.
 """
 
+import argparse
+import hashlib
+import json
+import os
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
 import requests
 from requests.auth import HTTPBasicAuth
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+# Prefer orjson for decoding API responses when it is installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+# (connect, read) timeout in seconds for every API request
+REQUEST_TIMEOUT = (5, 30)
+
+# How long a discovered Favourites collection ID is reused (seconds)
+FAVORITES_ID_TTL = 6 * 60 * 60
+
+# Exit codes for CI / scripted use
+EXIT_ERROR = 1          # request failed or no Favourites collection
+EXIT_OVER_LIMIT = 2     # more favorites than the sync's 1000-ROM API limit
+
+# On-disk cache for rarely changing metadata (collections, platforms)
+CACHE_DIR = Path(tempfile.gettempdir()) / "romm-cache"
+
+
+def fetch_json(session, url, params=None):
+    """GET a URL and return the decoded JSON body."""
+    response = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return _loads(response.content)
+
+
+def _cache_path(key):
+    """Return the cache file for a JSON-serializable key."""
+    digest = hashlib.blake2b(json.dumps(key).encode(), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+
+def cache_read(key, ttl):
+    """Return the cached value for key if it is younger than ttl seconds, else None."""
+    cache_path = _cache_path(key)
+    try:
+        if ttl > 0 and time.time() - cache_path.stat().st_mtime < ttl:
+            with open(cache_path, encoding="utf-8") as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def cache_write(key, data):
+    """Atomically store a JSON-serializable value for key (best effort)."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, _cache_path(key))
+    except OSError:
+        pass
+
+
+def cached_get(session, url, params=None, ttl=300):
+    """GET a URL through a small on-disk JSON cache.
+    
+    Responses are keyed by user, URL and query parameters and reused for
+    ``ttl`` seconds, so repeated troubleshooting runs skip the round-trip.
+    A ``ttl`` of 0 always fetches fresh data.
+    """
+    user = getattr(session.auth, "username", "")
+    key = [user, url, sorted((params or {}).items())]
+    
+    data = cache_read(key, ttl)
+    if data is None:
+        data = fetch_json(session, url, params)
+        cache_write(key, data)
+    return data
+
+
+class Endpoints:
+    """RomM API URLs for one server, built once up front."""
+    
+    def __init__(self, server):
+        self.collections = f"{server}/api/collections"
+        self.platforms = f"{server}/api/platforms"
+        self.roms = f"{server}/api/roms"
+
+
+def preconnect(session, server):
+    """Open a pooled connection to the server in the background.
+    
+    DNS, TCP and TLS setup then overlap with the rest of startup, and the
+    first real request picks up the established keep-alive connection.
+    Failures are ignored because that request will report them.
+    """
+    def warm_up():
+        try:
+            session.head(f"{server}/api/", timeout=(5, 10))
+        except requests.RequestException:
+            pass
+    
+    threading.Thread(target=warm_up, daemon=True).start()
+
+
+def log_transfer(response, *args, **kwargs):
+    """Response hook: report compression and wire vs decoded size on stderr."""
+    decoded = len(response.content)
+    wire = response.raw.tell() if response.raw is not None else decoded
+    encoding = response.headers.get("Content-Encoding", "identity")
+    sys.stderr.write(
+        f"  [{response.status_code}] {response.url}: {encoding}, "
+        f"{wire} bytes on the wire, {decoded} decoded\n"
+    )
+
+
+def dump_json(data):
+    """Serialize data as indented JSON bytes with a trailing newline."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, indent=2) + "\n").encode("utf-8")
+
+
+def find_favorites(collections):
+    """Return the first collection with 'favour' in its name, or None."""
+    return next(
+        (c for c in collections if 'favour' in (c.get('name') or '').casefold()),
+        None
+    )
+
+
+def unpack(data):
+    """Split a ROM listing into (items, total).
+    
+    Handles both the paginated ``{"items": [...], "total": N}`` response and
+    a bare list.
+    """
+    if isinstance(data, dict) and "items" in data:
+        items = data["items"]
+        return items, data.get("total", len(items))
+    return data, len(data)
+
+
+def fetch_counts(session, url, params=None):
+    """GET a ROM listing and return (returned, total) without keeping the items.
+    
+    Only the counts are reported, so the ROM dicts are dropped as soon as they
+    have been counted instead of being held for the rest of the run.
+    """
+    with session.get(url, params=params, timeout=REQUEST_TIMEOUT) as response:
+        response.raise_for_status()
+        items, total = unpack(_loads(response.content))
+    return len(items), total
+
 
 def main():
-    if len(sys.argv) < 4:
-        print("Usage: python3 debug-favorites.py <server_url> <username> <password>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Troubleshoot RomM favorites collection issues",
+        epilog=f"Exit status: 0 on success, {EXIT_ERROR} if a request failed or no "
+               f"Favourites collection exists, {EXIT_OVER_LIMIT} if there are more "
+               "than 1000 favorites.",
+    )
+    parser.add_argument("server", help="RomM server URL")
+    parser.add_argument("username", help="RomM username")
+    parser.add_argument("password", help="RomM password")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=1,
+        help="Number of ROMs to request per probe (default: 1, totals are still reported)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Request up to 1000 ROMs per probe, like the sync does",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of ROM probes in flight at once (default: 8)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch collections and platforms from the server",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print a machine-readable JSON summary instead of the report",
+    )
+    parser.add_argument(
+        "--per-platform",
+        action="store_true",
+        help="Also fetch platforms and probe favorites on each one",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log response compression and sizes to stderr",
+    )
+    args = parser.parse_args()
+    
+    server = args.server.rstrip('/')
+    parsed = urlparse(server)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        parser.error(f"server must be an http:// or https:// URL, got {args.server!r}")
+    api = Endpoints(server)
+    username = args.username
+    password = args.password
+    limit = 1000 if args.full else args.limit
+    cache_ttl = 0 if args.no_cache else 300
     
-    server = sys.argv[1]
-    username = sys.argv[2]
-    password = sys.argv[3]
+    # Collect output per phase and write it in one call instead of per line
+    out = []
+    log = out.append
+    summary = {
+        "server": server,
+        "matched_collections": None,
+        "platforms": None,
+        "favorites": {"id": None, "total": None, "per_platform": []},
+        "errors": [],
+    }
+    
+    def flush():
+        if out and not args.json:
+            sys.stdout.write("\n".join(out) + "\n")
+            sys.stdout.flush()
+        out.clear()
+    
+    def error(message):
+        summary["errors"].append(message.strip())
+        log(message)
+    
+    def finish(status):
+        flush()
+        if args.json:
+            sys.stdout.buffer.write(dump_json(summary))
+            sys.stdout.flush()
+        return status
     
     # Create session
     session = requests.Session()
     session.auth = HTTPBasicAuth(username, password)
+    session.headers.update({
+        "Accept": "application/json",
+        "User-Agent": "romm-sync-debug/1.0",
+        # Every encoding urllib3 can decode here: gzip/deflate, plus br and
+        # zstd when the brotli / zstandard packages are installed
+        "Accept-Encoding": ACCEPT_ENCODING,
+    })
+    if args.verbose:
+        session.hooks["response"].append(log_transfer)
     
-    print(f"Connecting to: {server}")
-    print(f"Username: {username}")
-    print("=" * 60)
+    # Share keep-alive connections to the RomM host across all requests, with
+    # one pooled connection per concurrent probe so none are opened and
+    # discarded while the probes run in parallel
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=max(1, args.concurrency),
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    preconnect(session, server)
+    
+    log(f"Connecting to: {server}")
+    log(f"Username: {username}")
+    log("=" * 60)
+    flush()
     
     # Get collections
-    print("\n1. Fetching collections...")
+    log("\n1. Fetching collections...")
+    favorites_key = ["favorites_id", username, server]
+    favorites_id = None if args.no_cache else cache_read(favorites_key, FAVORITES_ID_TTL)
     try:
-        response = session.get(f"{server}/api/collections")
-        response.raise_for_status()
-        collections = response.json()
-        
-        print(f"Found {len(collections)} collections:")
-        for col in collections:
-            print(f"  - ID: {col.get('id')}, Name: '{col.get('name')}', ROMs: {col.get('roms_count', 'N/A')}")
+        if favorites_id:
+            favorites_col = None
+            log(f"✓ Using cached Favourites collection: ID={favorites_id} (--no-cache to re-check)")
+        else:
+            # Ask the server to filter by name first; scan the full list if
+            # the filter matched nothing
+            collections = cached_get(session, api.collections, {"name": "Favourites"}, ttl=cache_ttl)
+            summary["matched_collections"] = len(collections)
+            if not collections:
+                collections = cached_get(session, api.collections, ttl=cache_ttl)
+            
+            log(f"Found {len(collections)} collections:")
+            for col in collections:
+                cid, cname, croms = col.get('id'), col.get('name'), col.get('roms_count', 'N/A')
+                log(f"  - ID: {cid}, Name: '{cname}', ROMs: {croms}")
+            
+            favorites_col = find_favorites(collections)
+            favorites_id = favorites_col and favorites_col.get('id')
+            if favorites_id:
+                cache_write(favorites_key, favorites_id)
         
-        # Find favorites
-        favorites_id = None
-        for col in collections:
-            if 'favour' in col.get('name', '').lower():
-                favorites_id = col.get('id')
-                print(f"\n✓ Found Favourites collection: ID={favorites_id}, Name='{col.get('name')}'")
-                print(f"  ROMs in collection: {col.get('roms_count', 'Unknown')}")
-                break
+        summary["favorites"]["id"] = favorites_id
+        if favorites_col:
+            log(f"\n✓ Found Favourites collection: ID={favorites_id}, Name='{favorites_col.get('name')}'")
+            log(f"  ROMs in collection: {favorites_col.get('roms_count', 'Unknown')}")
         
         if not favorites_id:
-            print("\n✗ No Favourites collection found!")
-            print("  Looking for collections with 'favour' in the name")
-            return
+            log("\n✗ No Favourites collection found!")
+            log("  Looking for collections with 'favour' in the name")
+            summary["errors"].append("No Favourites collection found")
+            return finish(EXIT_ERROR)
             
     except Exception as e:
-        print(f"Error fetching collections: {e}")
-        return
+        error(f"Error fetching collections: {e}")
+        return finish(EXIT_ERROR)
+    flush()
     
-    # Get platforms
-    print("\n2. Fetching platforms...")
-    try:
-        response = session.get(f"{server}/api/platforms")
-        response.raise_for_status()
-        platforms = response.json()
-        print(f"Found {len(platforms)} platforms")
-    except Exception as e:
-        print(f"Error fetching platforms: {e}")
-        return
+    # Get platforms (only the per-platform probes need them)
+    platforms = []
+    if args.per_platform:
+        log("\n2. Fetching platforms...")
+        try:
+            platforms = cached_get(session, api.platforms, ttl=cache_ttl)
+            summary["platforms"] = len(platforms)
+            log(f"Found {len(platforms)} platforms")
+        except Exception as e:
+            error(f"Error fetching platforms: {e}")
+            return finish(EXIT_ERROR)
+        flush()
+    
+    # The ROM queries only depend on favorites_id and the platform list, so
+    # issue them all at once and report the results in order
+    test_platform = platforms[0] if platforms else None
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        if test_platform:
+            platform_id = test_platform.get('id')
+            all_roms_future = executor.submit(fetch_counts, session, api.roms, {
+                "platform_id": platform_id,
+                "limit": limit
+            })
+            fav_roms_future = executor.submit(fetch_counts, session, api.roms, {
+                "platform_id": platform_id,
+                "collection_id": favorites_id,
+                "limit": limit
+            })
+        all_fav_future = executor.submit(fetch_counts, session, api.roms, {
+            "collection_id": favorites_id,
+            "limit": limit
+        })
+        # One count-only probe per platform to see where favorites live
+        platform_futures = [
+            (p, executor.submit(fetch_counts, session, api.roms, {
+                "platform_id": p.get('id'),
+                "collection_id": favorites_id,
+                "limit": 1
+            }))
+            for p in platforms
+        ]
     
     # Test getting ROMs with favorites filter
-    print("\n3. Testing ROM fetch with favorites filter...")
-    if platforms:
-        test_platform = platforms[0]
-        platform_id = test_platform.get('id')
+    if test_platform:
+        log("\n3. Testing ROM fetch with favorites filter...")
         platform_name = test_platform.get('name')
         
-        print(f"Testing with platform: {platform_name} (ID: {platform_id})")
+        log(f"Testing with platform: {platform_name} (ID: {platform_id})")
         
         # Test 1: Get all ROMs for platform
         try:
-            response = session.get(f"{server}/api/roms", params={
-                "platform_id": platform_id,
-                "limit": 1000
-            })
-            response.raise_for_status()
-            all_roms_data = response.json()
-            
-            if isinstance(all_roms_data, dict) and "items" in all_roms_data:
-                all_roms = all_roms_data["items"]
-                total_count = all_roms_data.get("total", len(all_roms))
-            else:
-                all_roms = all_roms_data
-                total_count = len(all_roms)
-            
-            print(f"  All ROMs: {len(all_roms)} returned, {total_count} total")
+            returned, total_count = all_roms_future.result()
+            log(f"  All ROMs: {returned} returned, {total_count} total")
         except Exception as e:
-            print(f"  Error fetching all ROMs: {e}")
-            all_roms = []
+            error(f"  Error fetching all ROMs: {e}")
         
         # Test 2: Get favorites only for platform
         try:
-            response = session.get(f"{server}/api/roms", params={
-                "platform_id": platform_id,
-                "collection_id": favorites_id,
-                "limit": 1000
-            })
-            response.raise_for_status()
-            fav_roms_data = response.json()
-            
-            if isinstance(fav_roms_data, dict) and "items" in fav_roms_data:
-                fav_roms = fav_roms_data["items"]
-                fav_total = fav_roms_data.get("total", len(fav_roms))
-            else:
-                fav_roms = fav_roms_data
-                fav_total = len(fav_roms)
-            
-            print(f"  Favorites: {len(fav_roms)} returned, {fav_total} total")
+            returned, fav_total = fav_roms_future.result()
+            log(f"  Favorites: {returned} returned, {fav_total} total")
         except Exception as e:
-            print(f"  Error fetching favorites: {e}")
-            fav_roms = []
+            error(f"  Error fetching favorites: {e}")
+    flush()
     
     # Test 3: Get all favorites across all platforms
-    print("\n4. Testing all favorites (no platform filter)...")
+    log("\n4. Testing all favorites (no platform filter)...")
+    all_fav_total = None
     try:
-        response = session.get(f"{server}/api/roms", params={
-            "collection_id": favorites_id,
-            "limit": 1000
-        })
-        response.raise_for_status()
-        all_fav_data = response.json()
-        
-        if isinstance(all_fav_data, dict) and "items" in all_fav_data:
-            all_favs = all_fav_data["items"]
-            all_fav_total = all_fav_data.get("total", len(all_favs))
-        else:
-            all_favs = all_fav_data
-            all_fav_total = len(all_favs)
-        
-        print(f"  Total favorites (all platforms): {len(all_favs)} returned, {all_fav_total} total")
+        returned, all_fav_total = all_fav_future.result()
+        summary["favorites"]["total"] = all_fav_total
+        log(f"  Total favorites (all platforms): {returned} returned, {all_fav_total} total")
         
         if all_fav_total > 1000:
-            print(f"\n⚠ WARNING: You have {all_fav_total} total favorites!")
-            print("  The API limit is 1000, so not all favorites will be synced.")
-            print("  Consider using platform-specific syncs or reducing favorites.")
+            log(f"\n⚠ WARNING: You have {all_fav_total} total favorites!")
+            log("  The API limit is 1000, so not all favorites will be synced.")
+            log("  Consider using platform-specific syncs or reducing favorites.")
         
     except Exception as e:
-        print(f"  Error fetching all favorites: {e}")
+        error(f"  Error fetching all favorites: {e}")
+    flush()
+    
+    # Test 4: Favorites per platform
+    if args.per_platform:
+        log("\n5. Favorites per platform...")
+        per_platform = []
+        failed_platforms = 0
+        for p, future in platform_futures:
+            try:
+                _, total = future.result()
+            except Exception as e:
+                error(f"  Error fetching favorites for {p.get('name')}: {e}")
+                failed_platforms += 1
+                continue
+            if total:
+                per_platform.append((p.get('name'), total))
+        
+        per_platform.sort(key=lambda row: row[1], reverse=True)
+        for name, total in per_platform:
+            summary["favorites"]["per_platform"].append({"name": name, "total": total})
+            log(f"  {total:>6}  {name}")
+        empty_platforms = len(platforms) - len(per_platform) - failed_platforms
+        log(f"  {len(per_platform)} platform(s) with favorites, {empty_platforms} without")
+    
+    log("\n" + "=" * 60)
+    log("Debug complete!")
     
-    print("\n" + "=" * 60)
-    print("Debug complete!")
+    if summary["errors"]:
+        return finish(EXIT_ERROR)
+    if all_fav_total is not None and all_fav_total > 1000:
+        return finish(EXIT_OVER_LIMIT)
+    return finish(0)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -26,7 +26,7 @@ choice=$(zenity --list --title="RomM Sync" \
 case "$choice" in
     "Sync Favorites (Metadata + Images)")
         # Show output in real-time text window
-        ~/romm-sync/romm-sync -s "$ROMM_SERVER" -u "$ROMM_USER" -p "$ROMM_PASSWORD" --target steamdeck 2>&1 | \
+        ~/romm-sync/romm-sync -s "$ROMM_SERVER" -u "$ROMM_USER" -p "$ROMM_PASSWORD" --target steamdeck --workers 1 2>&1 | \
             zenity --text-info --title="RomM Sync - Syncing Favorites" --width=900 --height=700 --auto-scroll
         
         # Ask to restart ES-DE
@@ -36,7 +36,7 @@ case "$choice" in
         ;;
     "Sync Favorites + Download ROMs")
         # Show output in real-time text window
-        ~/romm-sync/romm-sync -s "$ROMM_SERVER" -u "$ROMM_USER" -p "$ROMM_PASSWORD" --target steamdeck --download-roms 2>&1 | \
+        ~/romm-sync/romm-sync -s "$ROMM_SERVER" -u "$ROMM_USER" -p "$ROMM_PASSWORD" --target steamdeck --download-roms --workers 1 2>&1 | \
             zenity --text-info --title="RomM Sync - Syncing Favorites + Downloading ROMs" --width=900 --height=700 --auto-scroll
         
         # Ask to restart ES-DE
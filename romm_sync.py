@@ -11,15 +11,27 @@ Usage:
 """
 
 import argparse
+import io
+import json
 import os
 import sys
+import threading
 import time
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+import types
+from concurrent.futures import ThreadPoolExecutor, as_completed
+try:
+    # lxml parses and serializes in C; fall back to the stdlib when it isn't installed
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 from datetime import datetime
+from email.utils import formatdate
 from pathlib import Path
 from urllib.parse import urljoin
 import re
+import shutil
+import sqlite3
+import tempfile
 from typing import Optional
 import logging
 import requests
@@ -27,6 +39,13 @@ from requests.auth import HTTPBasicAuth
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+# Prefer orjson for decoding API responses when it is installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # Force unbuffered output for real-time progress display (especially when piped to zenity)
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(line_buffering=True)
@@ -34,11 +53,15 @@ if hasattr(sys.stderr, "reconfigure"):
     sys.stderr.reconfigure(line_buffering=True)
 
 
-def setup_logging():
+def setup_logging(verbose: bool = False):
     """
     Configure logging to write to both file and console.
     
     Log files are stored in the ~/romm-sync directory with timestamps.
+    
+    Args:
+        verbose: If True, also show DEBUG messages (API queries, sample ROM data,
+            per-image downloads).
     """
     log_dir = Path.home() / "romm-sync"
     log_dir.mkdir(parents=True, exist_ok=True)
@@ -47,7 +70,7 @@ def setup_logging():
     log_file = log_dir / f"romm-sync_{timestamp}.log"
     
     logging.basicConfig(
-        level=logging.INFO,
+        level=logging.DEBUG if verbose else logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s',
         handlers=[
             logging.FileHandler(log_file),
@@ -80,9 +103,52 @@ TARGET_CONFIGS = {
 # Default gamelist output path (for backward compatibility)
 GAMELIST_OUTPUT_PATH = "./.emulationstation/gamelists"
 
+# IGDB game modes that mark a game as multiplayer (<players>4</players>)
+MULTIPLAYER_MODES = frozenset({"Multiplayer", "Co-operative"})
+
+# Number of cover images downloaded in parallel (shared by all platforms)
+IMAGE_DOWNLOAD_WORKERS = 8
+
+# Number of platforms synced in parallel (each with its own image workers)
+PLATFORM_SYNC_WORKERS = 8
+
+# ROMs requested per /roms page when prefetching the library, and how many
+# pages are fetched in parallel once the first page reveals the total
+ROM_PAGE_SIZE = 1000
+PAGE_FETCH_WORKERS = 4
+
+# Cover images are streamed to disk in 64 KiB blocks
+IMAGE_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Number of ROM files downloaded in parallel (shared by all platforms)
+ROM_DOWNLOAD_WORKERS = 4
+
+# ROM downloads are copied in 1 MiB blocks (64 KiB when rate limited, so the
+# limit is applied smoothly); progress is redrawn at most twice a second on a
+# terminal, and printed as a new line every 5 seconds when piped (e.g. to zenity)
+ROM_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+RATE_LIMITED_CHUNK_SIZE = 64 * 1024
+PROGRESS_INTERVAL = 0.5
+PIPED_PROGRESS_INTERVAL = 5.0
+
+# Process umask, read once at startup (os.umask can only be read by setting it,
+# which isn't safe once worker threads are creating files)
+FILE_UMASK = os.umask(0)
+os.umask(FILE_UMASK)
+
+# First byte position of a Content-Range header ("bytes 100-199/200")
+CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-")
+
+# Control characters that are not allowed in XML 1.0 (lxml refuses to serialize them)
+XML_INVALID_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# ROM and media directory settings in ES-DE's es_settings.xml
+ESDE_ROM_DIRECTORY_RE = re.compile(r'<string name="ROMDirectory" value="([^"]+)"')
+ESDE_MEDIA_DIRECTORY_RE = re.compile(r'<string name="MediaDirectory" value="([^"]+)"')
+
 # Platform mapping: RomM platform slug -> EmulationStation folder name
 # Compatible with both RetroPie and ES-DE (SteamDeck)
-PLATFORM_MAP = {
+PLATFORM_MAP = types.MappingProxyType({
     "3do": "3do",
     "amiga": "amiga",
     "amstrad-cpc": "amstradcpc",
@@ -145,7 +211,10 @@ PLATFORM_MAP = {
     "playstation-3": "ps3",
     "playstation-portable": "psp",
     "playstation-vita": "psvita",
-}
+})
+
+# Every EmulationStation folder name known to PLATFORM_MAP
+ES_FOLDERS = frozenset(PLATFORM_MAP.values())
 
 
 class RomMClient:
@@ -153,6 +222,7 @@ class RomMClient:
 
     def __init__(self, server_url: str, username: str, password: str):
         self.server_url = server_url.rstrip("/")
+        self._api = self.server_url + "/api"
         self.auth = HTTPBasicAuth(username, password)
         self.session = requests.Session()
         self.session.auth = self.auth
@@ -163,24 +233,69 @@ class RomMClient:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Size the pool for parallel downloads so keep-alive connections are
+        # reused instead of being discarded when the pool is full
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=retry_strategy,
+            pool_block=False,
+        )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        
+        # Cover images are retried by download_image itself, where every attempt
+        # goes through the --max-rps limiter, so their sessions don't retry
+        self.cover_session = requests.Session()
+        self.cover_session.auth = self.auth
+        cover_adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=0, raise_on_status=False),
+            pool_block=False,
+        )
+        self.cover_session.mount("http://", cover_adapter)
+        self.cover_session.mount("https://", cover_adapter)
+        self.cover_session.headers["Connection"] = "keep-alive"
+        
+        # External cover URLs (IGDB etc.) get their own pooled session without
+        # the RomM credentials, instead of a fresh connection per image
+        self.external_session = requests.Session()
+        external_adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=0, raise_on_status=False),
+            pool_block=False,
+        )
+        self.external_session.mount("http://", external_adapter)
+        self.external_session.mount("https://", external_adapter)
+        
+        # Collections don't change during a sync, so fetch them only once
+        self._collections_cache = None
+        self._kid_friendly_rom_ids = None
 
     def _get(self, endpoint: str, params: dict = None, timeout: int = 120) -> dict:
         """Make a GET request to the API."""
-        url = f"{self.server_url}/api{endpoint}"
+        url = self._api + endpoint
         response = self.session.get(url, params=params, timeout=timeout)
         response.raise_for_status()
-        return response.json()
+        try:
+            return _loads(response.content)
+        except ValueError as e:
+            # Keep reporting bad bodies as request errors, like response.json() did
+            raise requests.RequestException(f"Invalid JSON from {url}: {e}", response=response) from e
 
     def get_platforms(self) -> list:
         """Get all platforms from RomM."""
         return self._get("/platforms")
     
     def get_collections(self) -> list:
-        """Get all collections from RomM."""
-        return self._get("/collections")
+        """Get all collections from RomM (cached for the lifetime of the client)."""
+        if self._collections_cache is None:
+            self._collections_cache = self._get("/collections")
+        return self._collections_cache
     
     def get_favorites_collection_id(self) -> Optional[int]:
         """Get the ID of the Favourites collection."""
@@ -198,15 +313,23 @@ class RomMClient:
                 return collection.get('id')
         return None
     
-    def get_kid_friendly_rom_ids(self) -> set:
-        """Get set of ROM IDs that are in the Kid Friendly collection.
+    def get_kid_friendly_rom_ids(self) -> frozenset:
+        """Get the set of ROM IDs that are in the Kid Friendly collection.
+        
+        The result is cached on the client, so every platform in a sync shares
+        a single request.
         
         Returns:
-            Set of ROM IDs marked as kid friendly.
+            Frozen set of ROM IDs marked as kid friendly (empty if there is no
+            such collection), for O(1) membership tests.
         """
+        if self._kid_friendly_rom_ids is not None:
+            return self._kid_friendly_rom_ids
+        
         collection_id = self.get_kid_friendly_collection_id()
         if not collection_id:
-            return set()
+            self._kid_friendly_rom_ids = frozenset()
+            return self._kid_friendly_rom_ids
         
         # Get all ROMs in the kid friendly collection
         roms_response = self.get_roms(collection_id=collection_id, limit=10000)
@@ -215,11 +338,13 @@ class RomMClient:
         elif isinstance(roms_response, list):
             roms = roms_response
         else:
-            return set()
+            self._kid_friendly_rom_ids = frozenset()
+            return self._kid_friendly_rom_ids
         
-        return {rom.get('id') for rom in roms if rom.get('id')}
+        self._kid_friendly_rom_ids = frozenset(rom.get('id') for rom in roms if rom.get('id'))
+        return self._kid_friendly_rom_ids
 
-    def get_roms(self, platform_id: int = None, limit: int = 1000, favorites_only: bool = False, collection_id: int = None) -> list:
+    def get_roms(self, platform_id: int = None, limit: int = 1000, favorites_only: bool = False, collection_id: int = None, offset: int = 0) -> list:
         """Get all ROMs for a platform.
         
         Args:
@@ -227,11 +352,14 @@ class RomMClient:
             limit: Maximum number of ROMs to return.
             favorites_only: If True, only return ROMs marked as favorites.
             collection_id: Optional collection ID to filter by.
+            offset: Number of ROMs to skip (for paging through large results).
         
         Returns:
             List of ROM dictionaries or dict with 'items' key.
         """
         params = {"limit": limit}
+        if offset:
+            params["offset"] = offset
         
         if collection_id:
             params["collection_id"] = collection_id
@@ -240,7 +368,7 @@ class RomMClient:
             collection_id = self.get_favorites_collection_id()
             if collection_id:
                 params["collection_id"] = collection_id
-                print(f"  DEBUG: Using Favorites collection_id={collection_id}")
+                logging.debug(f"Using Favorites collection_id={collection_id}")
             else:
                 # No favorites collection found - this will cause issues
                 # Return empty result to trigger error handling
@@ -249,16 +377,60 @@ class RomMClient:
         if platform_id is not None:
             params["platform_id"] = platform_id
         
-        print(f"  DEBUG: API query params: {params}")
+        logging.debug(f"API query params: {params}")
         result = self._get("/roms", params=params, timeout=180)
         
         if isinstance(result, dict) and "items" in result:
-            print(f"  DEBUG: API returned {len(result['items'])} ROMs (total: {result.get('total', 'unknown')})")
+            logging.debug(f"API returned {len(result['items'])} ROMs (total: {result.get('total', 'unknown')})")
         elif isinstance(result, list):
-            print(f"  DEBUG: API returned {len(result)} ROMs")
+            logging.debug(f"API returned {len(result)} ROMs")
         
         return result
 
+    def get_all_roms_grouped(self, favorites_only: bool = False, page_size: int = ROM_PAGE_SIZE) -> Optional[dict]:
+        """Fetch the whole library (or all favorites) once and group it by platform.
+        
+        Pages through /roms with limit/offset instead of issuing one request
+        per platform. The first page reports the total, after which the
+        remaining pages are fetched in parallel.
+        
+        Args:
+            favorites_only: If True, only fetch ROMs in the Favourites collection.
+            page_size: Number of ROMs to request per page.
+        
+        Returns:
+            Dict mapping platform ID to its list of ROM dictionaries, or None if
+            favorites were requested but no Favourites collection exists.
+        """
+        def fetch_page(offset):
+            return self.get_roms(limit=page_size, favorites_only=favorites_only, offset=offset)
+        
+        result = fetch_page(0)
+        if isinstance(result, dict) and result.get("_no_favorites_collection"):
+            return None
+        
+        if isinstance(result, dict) and "items" in result:
+            pages = [result["items"]]
+            total = result.get("total", len(result["items"]))
+        else:
+            # Unpaginated list response: everything came back at once
+            pages = [result]
+            total = len(result)
+        
+        # Step by what the server actually returned, in case it caps the limit
+        step = len(pages[0])
+        if step and step < total:
+            offsets = range(step, total, step)
+            with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as executor:
+                for page in executor.map(fetch_page, offsets):
+                    pages.append(page["items"] if isinstance(page, dict) else page)
+        
+        grouped = {}
+        for items in pages:
+            for rom in items:
+                grouped.setdefault(rom.get("platform_id"), []).append(rom)
+        return grouped
+
     def get_rom(self, rom_id: int) -> dict:
         """Get detailed info for a specific ROM."""
         return self._get(f"/roms/{rom_id}")
@@ -270,7 +442,7 @@ class RomMClient:
             return rom["url_cover"]
         # Fall back to local server if path exists
         elif rom.get("path_cover_s") or rom.get("path_cover_l"):
-            return f"{self.server_url}/api/roms/{rom['id']}/cover/small"
+            return f"{self._api}/roms/{rom['id']}/cover/small"
         return None
 
     def get_screenshot_url(self, rom: dict) -> Optional[str]:
@@ -289,15 +461,23 @@ class RomMClient:
     
     def get_rom_download_url(self, rom_id: int) -> str:
         """Get the download URL for a ROM file."""
-        return f"{self.server_url}/api/roms/{rom_id}/content/download"
+        return f"{self._api}/roms/{rom_id}/content/download"
     
-    def download_rom_file(self, rom: dict, output_path: Path, show_progress: bool = True) -> bool:
+    def download_rom_file(self, rom: dict, output_path: Path, show_progress: bool = True, rate_limiter: "TokenBucket" = None) -> bool:
         """Download a ROM file from RomM.
         
+        The file is streamed to `<output_path>.part` and only renamed into place
+        once complete, so an interrupted download is never mistaken for a
+        finished one. The ETag (or Last-Modified) of the download is kept next
+        to the .part file; a leftover .part file is resumed with a Range request
+        guarded by If-Range, so a ROM that changed on the server is downloaded
+        again in full instead of being spliced onto the old data.
+        
         Args:
             rom: ROM dictionary with id and fs_name.
             output_path: Path where the ROM file should be saved.
             show_progress: Whether to show download progress.
+            rate_limiter: Optional TokenBucket (in bytes) shared by all downloads.
         
         Returns:
             True if download succeeded, False otherwise.
@@ -309,48 +489,190 @@ class RomMClient:
             return False
         
         download_url = self.get_rom_download_url(rom_id)
+        part_path = output_path.with_name(output_path.name + ".part")
+        validator_path = output_path.with_name(output_path.name + ".part.validator")
+        interactive = show_progress and stdout_is_interactive()
         
         try:
-            response = self.session.get(download_url, stream=True, timeout=300)
+            # Pick up where an interrupted download left off, but only if we know
+            # which version of the ROM the partial file belongs to
+            try:
+                offset = part_path.stat().st_size
+                validator = validator_path.read_text().strip()
+            except FileNotFoundError:
+                offset = 0
+                validator = ""
+            headers = {"Range": f"bytes={offset}-", "If-Range": validator} if offset and validator else {}
+            
+            response = self.session.get(download_url, stream=True, timeout=300, headers=headers)
+            if response.status_code == 206 and headers and content_range_start(response) != offset:
+                # Not the range we asked for; start over
+                response.close()
+                response = self.session.get(download_url, stream=True, timeout=300)
+            elif response.status_code == 416:
+                # The partial file is no longer a prefix of the ROM; start over
+                response.close()
+                response = self.session.get(download_url, stream=True, timeout=300)
             response.raise_for_status()
             
-            # Get file size if available
-            total_size = int(response.headers.get('content-length', 0))
+            # Append only if the server honoured the range for the same version of
+            # the ROM, otherwise rewrite (If-Range makes a changed ROM come back as 200)
+            if response.status_code == 206:
+                logging.info(f"Resuming {fs_name} from {format_bytes(offset)}")
+                mode = 'ab'
+            else:
+                mode = 'wb'
+                validator = resume_validator(response)
+                if validator:
+                    validator_path.write_text(validator)
+                else:
+                    try:
+                        validator_path.unlink()
+                    except FileNotFoundError:
+                        pass
             
-            # Write file in chunks with progress
-            downloaded = 0
-            start_time = time.time()
-            chunk_size = 8192
+            # Get the size of what is left to download, if available
+            total_size = int(response.headers.get('content-length', 0))
             
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        # Show progress every 1MB or at completion
-                        if show_progress and total_size > 0 and (downloaded % (1024 * 1024) == 0 or downloaded == total_size):
-                            elapsed = time.time() - start_time
-                            if elapsed > 0:
-                                speed = downloaded / elapsed
-                                percent = (downloaded / total_size) * 100
-                                print(f"\r      Progress: {percent:.1f}% ({format_bytes(downloaded)}/{format_bytes(total_size)}) @ {format_bytes(speed)}/s", end='', flush=True)
+            # Copy the raw stream to disk in 1 MiB blocks, reporting progress as we go
+            response.raw.decode_content = True
+            chunk_size = RATE_LIMITED_CHUNK_SIZE if rate_limiter else ROM_DOWNLOAD_CHUNK_SIZE
+            with open(part_path, mode) as f:
+                writer = ProgressWriter(f, total_size if show_progress else 0, rate_limiter, interactive)
+                shutil.copyfileobj(response.raw, writer, chunk_size)
+                writer.report()
+            downloaded = writer.downloaded
+            if total_size and downloaded < total_size:
+                raise IOError(f"connection closed after {format_bytes(downloaded)} of {format_bytes(total_size)}")
+            os.replace(part_path, output_path)
+            try:
+                validator_path.unlink()
+            except FileNotFoundError:
+                pass
             
-            if show_progress and total_size > 0:
+            if interactive and total_size > 0:
                 print()  # New line after progress
             
             logging.info(f"Downloaded ROM file: {output_path} ({format_bytes(downloaded)})")
             return True
         except Exception as e:
-            if show_progress:
+            if interactive:
                 print()  # New line before error
+            # The .part file is kept so the next run can resume it
             print(f"    Error downloading {fs_name}: {e}")
-            # Clean up partial download
-            if output_path.exists():
-                output_path.unlink()
             return False
 
 
+def resume_validator(response) -> str:
+    """Return the value to send as If-Range when resuming this download.
+    
+    A strong ETag is preferred; weak ETags can't be used with If-Range, so
+    Last-Modified is the fallback. Empty if the server sent neither.
+    """
+    etag = response.headers.get("ETag", "")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified", "")
+
+
+def content_range_start(response) -> Optional[int]:
+    """Return the first byte position of a 206 response's Content-Range, if any."""
+    match = CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
+
+
+class TokenBucket:
+    """Thread-safe token bucket for capping a rate shared by several threads.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`. A
+    consume() larger than what is available runs the bucket into debt, and the
+    caller sleeps until the debt is paid back, so the long-run rate holds even
+    for requests bigger than the capacity.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: float = 1) -> None:
+        """Take `amount` tokens, sleeping as long as needed to stay under the rate."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class ProgressWriter:
+    """File wrapper that counts written bytes and prints a throttled progress line.
+    
+    Progress is printed only when the total size is known (non-zero): redrawn
+    in place at most every PROGRESS_INTERVAL seconds on a terminal, otherwise
+    as a new line every PIPED_PROGRESS_INTERVAL seconds. If a rate limiter is
+    given, each write waits for its bytes to be available.
+    """
+
+    def __init__(self, f, total_size: int = 0, rate_limiter: TokenBucket = None, interactive: bool = True):
+        self.f = f
+        self.rate_limiter = rate_limiter
+        self.interactive = interactive
+        self.interval = PROGRESS_INTERVAL if interactive else PIPED_PROGRESS_INTERVAL
+        self.total_size = total_size
+        self.total_size_str = format_bytes(total_size)
+        self.downloaded = 0
+        self.start_time = time.monotonic()
+        self.last_print = self.start_time
+
+    def write(self, data: bytes) -> int:
+        if self.rate_limiter:
+            self.rate_limiter.consume(len(data))
+        self.f.write(data)
+        self.downloaded += len(data)
+        now = time.monotonic()
+        if now - self.last_print >= self.interval:
+            self.last_print = now
+            self.report()
+        return len(data)
+
+    def report(self):
+        """Print the current progress line (no-op when the total size is unknown)."""
+        if self.total_size <= 0:
+            return
+        elapsed = time.monotonic() - self.start_time
+        speed = self.downloaded / elapsed if elapsed > 0 else 0
+        percent = (self.downloaded / self.total_size) * 100
+        print_progress(
+            f"      Progress: {percent:.1f}% ({format_bytes(self.downloaded)}/{self.total_size_str}) @ {format_bytes(speed)}/s",
+            self.interactive,
+        )
+
+
+def stdout_is_interactive() -> bool:
+    """Return True if stdout is a terminal that can redraw a progress line.
+    
+    Carriage-return progress lines are only useful on a terminal; when output
+    is piped (the launchers feed it to zenity or dialog) or buffered, progress
+    is printed as separate, less frequent lines instead.
+    """
+    isatty = getattr(sys.stdout, "isatty", None)
+    return bool(isatty and isatty())
+
+
+def print_progress(text: str, interactive: bool) -> None:
+    """Redraw `text` in place on a terminal, or print it as its own line."""
+    if interactive:
+        sys.stdout.write("\r" + text)
+    else:
+        sys.stdout.write(text + "\n")
+    sys.stdout.flush()
+
+
 def format_bytes(bytes_count: int) -> str:
     """Format bytes into human-readable size.
     
@@ -367,136 +689,217 @@ def format_bytes(bytes_count: int) -> str:
     return f"{bytes_count:.1f} TB"
 
 
+# datetime.fromisoformat only accepts a trailing "Z" from Python 3.11 on
+if sys.version_info >= (3, 11):
+    def _normalize_iso_date(date_str: str) -> str:
+        return date_str
+else:
+    def _normalize_iso_date(date_str: str) -> str:
+        return date_str.replace("Z", "+00:00")
+
+
 def format_date(date_str: Optional[str]) -> str:
     """Convert date to EmulationStation format (YYYYMMDDTHHMMSS)."""
     if not date_str:
         return ""
     try:
         # Try parsing ISO format
-        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        dt = datetime.fromisoformat(_normalize_iso_date(date_str))
         return dt.strftime("%Y%m%dT%H%M%S")
-    except (ValueError, AttributeError):
+    except (ValueError, AttributeError, TypeError):
         return ""
 
 
-def create_gamelist_xml(roms: list, platform_slug: str, retropie_folder: str, rom_base_path: str = None, kid_friendly_rom_ids: set = None, target_config: dict = None) -> ET.Element:
-    """Create a gamelist.xml ElementTree from ROM data.
+def cover_image_name(rom_filename: str) -> str:
+    """Return the cover image file name for a ROM file name (game.zip -> game.png).
+    
+    Equivalent to f"{Path(rom_filename).stem}.png" without building a Path.
+    """
+    name = rom_filename.rpartition("/")[2]
+    return (name.rpartition(".")[0] or name) + ".png"
+
+
+def make_temp_file(dest_path: Path) -> Path:
+    """Create an empty, uniquely named `.part` file next to `dest_path`.
+    
+    Writing to a unique name and then os.replace()-ing it over `dest_path`
+    keeps concurrent writers of the same file from tripping over each other.
+    """
+    fd, name = tempfile.mkstemp(dir=dest_path.parent, prefix=dest_path.name + ".", suffix=".part")
+    os.close(fd)
+    # mkstemp creates the file private to the owner; give it the mode a plain
+    # open() would have, so the final file honours the user's umask
+    os.chmod(name, 0o666 & ~FILE_UMASK)
+    return Path(name)
+
+
+def _xml_text(value) -> Optional[str]:
+    """Return `value` as element text with characters XML can't hold removed.
+    
+    None stays None (an empty element), as ElementTree would write it.
+    """
+    if value is None:
+        return None
+    return XML_INVALID_CHARS.sub("", str(value))
+
+
+def _indent_game(game: ET.Element) -> None:
+    """Indent a flat <game> element in place as a child of <gameList>."""
+    children = list(game)
+    if not children:
+        return
+    game.text = "\n    "
+    for child in children:
+        child.tail = "\n    "
+    children[-1].tail = "\n  "
+
+
+def _build_game_element(rom: dict, rom_prefix: str, image_dir: str, kid_friendly_rom_ids: frozenset) -> ET.Element:
+    """Build the (unindented) <game> element for one ROM.
+    
+    Args:
+        rom: ROM dictionary from RomM API.
+        rom_prefix: Prefix for the ROM path (relative "./" or an absolute base).
+        image_dir: Directory written in front of the cover image file name.
+        kid_friendly_rom_ids: Set of ROM IDs that should be marked as kid games.
+    """
+    game = ET.Element("game")
+
+    # Path to the ROM file
+    filename = rom.get("fs_name", "") or rom.get("file_name", "")
+    rom_name = rom.get("name", "Unknown")
+    
+    # Use filename if available, otherwise use ROM name
+    if not filename:
+        filename = rom_name
+    
+    path_elem = ET.SubElement(game, "path")
+    # Formatted rather than concatenated: a ROM with no file name and a null
+    # name gets ./None, as before, instead of a TypeError
+    path_elem.text = _xml_text(f"{rom_prefix}{filename}")
+
+    # Game name
+    name_elem = ET.SubElement(game, "name")
+    name_elem.text = _xml_text(rom_name)
+
+    # Description
+    if rom.get("summary"):
+        desc_elem = ET.SubElement(game, "desc")
+        desc_elem.text = _xml_text(rom["summary"])
+
+    # Cover image
+    if rom.get("url_cover") or rom.get("path_cover_s") or rom.get("path_cover_l"):
+        image_elem = ET.SubElement(game, "image")
+        # Use ROM filename (without extension) for image name to match ES-DE expectations
+        image_elem.text = _xml_text(f"{image_dir}/{cover_image_name(filename or 'Unknown')}")
+
+    # IGDB metadata may be missing or null
+    igdb = rom.get("igdb_metadata") or {}
+    total_rating = igdb.get("total_rating")
+    developers = igdb.get("developers")
+    publishers = igdb.get("publishers")
+    game_modes = igdb.get("game_modes")
+
+    # Rating (convert from 0-100 to 0-1)
+    if total_rating:
+        rating_elem = ET.SubElement(game, "rating")
+        rating = float(total_rating) / 100.0
+        rating_elem.text = f"{rating:.2f}"
+
+    # Release date
+    first_release = rom.get("first_release_date")
+    if first_release:
+        date_elem = ET.SubElement(game, "releasedate")
+        date_elem.text = format_date(first_release)
+
+    # Developer
+    if developers:
+        dev_elem = ET.SubElement(game, "developer")
+        dev_elem.text = _xml_text(", ".join(developers))
+
+    # Publisher
+    if publishers:
+        pub_elem = ET.SubElement(game, "publisher")
+        pub_elem.text = _xml_text(", ".join(publishers))
+
+    # Genre
+    if rom.get("genres"):
+        genre_elem = ET.SubElement(game, "genre")
+        genre_elem.text = _xml_text(", ".join(rom["genres"]))
+
+    # Players
+    if game_modes:
+        players_elem = ET.SubElement(game, "players")
+        if MULTIPLAYER_MODES.intersection(game_modes):
+            players_elem.text = "4"
+        else:
+            players_elem.text = "1"
+    
+    # Kid game flag
+    rom_id = rom.get("id")
+    if rom_id and rom_id in kid_friendly_rom_ids:
+        kidgame_elem = ET.SubElement(game, "kidgame")
+        kidgame_elem.text = "true"
+
+    return game
+
+
+def write_gamelist_xml(roms: list, platform_slug: str, retropie_folder: str, output_path: Path, rom_base_path: str = None, kid_friendly_rom_ids: frozenset = None, target_config: dict = None) -> None:
+    """Write a gamelist.xml file from ROM data.
+    
+    Each <game> element is built, serialized and written straight to the file,
+    so memory use does not grow with the size of the platform and no full
+    tree has to be pretty-printed afterwards.
     
     Args:
         roms: List of ROM dictionaries from RomM API.
         platform_slug: RomM platform slug.
         retropie_folder: RetroPie folder name for this platform.
+        output_path: Path of the gamelist.xml file to write.
         rom_base_path: Optional base path for ROM files. If None, uses relative paths.
         kid_friendly_rom_ids: Set of ROM IDs that should be marked as kid games.
         target_config: Target system configuration dict (from TARGET_CONFIGS).
-    
-    Returns:
-        ElementTree root element for gamelist.xml.
     """
-    root = ET.Element("gameList")
-    
     if kid_friendly_rom_ids is None:
-        kid_friendly_rom_ids = set()
+        kid_friendly_rom_ids = frozenset()
     
     # Use default RetroPie config if no target specified
     if target_config is None:
         target_config = TARGET_CONFIGS["retropie"]
 
-    for rom in roms:
-        game = ET.SubElement(root, "game")
-
-        # Path to the ROM file
-        filename = rom.get("fs_name", "") or rom.get("file_name", "")
-        rom_name = rom.get("name", "Unknown")
-        
-        # Use filename if available, otherwise use ROM name
-        if not filename:
-            filename = rom_name
-        
-        path_elem = ET.SubElement(game, "path")
-        if rom_base_path:
-            # Use custom base path (e.g., /romm/library/roms/snes/game.sfc)
-            path_elem.text = f"{rom_base_path}/{retropie_folder}/{filename}"
-        else:
-            # Use relative path (e.g., ./game.sfc)
-            path_elem.text = f"./{filename}"
-
-        # Game name
-        name_elem = ET.SubElement(game, "name")
-        name_elem.text = rom_name
-
-        # Description
-        if rom.get("summary"):
-            desc_elem = ET.SubElement(game, "desc")
-            desc_elem.text = rom.get("summary", "")
-
-        # Cover image
-        if rom.get("url_cover") or rom.get("path_cover_s") or rom.get("path_cover_l"):
-            image_elem = ET.SubElement(game, "image")
-            # Use ROM filename (without extension) for image name to match ES-DE expectations
-            rom_filename_base = Path(filename).stem  # Remove extension
-            image_filename = f"{rom_filename_base}.png"
-            
-            # Build image path based on target config
-            images_base = os.path.expanduser(target_config["images_path"])
-            image_subdir = target_config["image_subdir"]
-            
-            if image_subdir:
-                image_elem.text = f"{images_base}/{retropie_folder}/{image_subdir}/{image_filename}"
-            else:
-                image_elem.text = f"{images_base}/{retropie_folder}/{image_filename}"
-
-        # Rating (convert from 0-100 to 0-1)
-        if rom.get("igdb_metadata", {}).get("total_rating"):
-            rating_elem = ET.SubElement(game, "rating")
-            rating = float(rom["igdb_metadata"]["total_rating"]) / 100.0
-            rating_elem.text = f"{rating:.2f}"
-
-        # Release date
-        first_release = rom.get("first_release_date")
-        if first_release:
-            date_elem = ET.SubElement(game, "releasedate")
-            date_elem.text = format_date(first_release)
-
-        # Developer
-        if rom.get("igdb_metadata", {}).get("developers"):
-            dev_elem = ET.SubElement(game, "developer")
-            dev_elem.text = ", ".join(rom["igdb_metadata"]["developers"])
-
-        # Publisher
-        if rom.get("igdb_metadata", {}).get("publishers"):
-            pub_elem = ET.SubElement(game, "publisher")
-            pub_elem.text = ", ".join(rom["igdb_metadata"]["publishers"])
-
-        # Genre
-        if rom.get("genres"):
-            genre_elem = ET.SubElement(game, "genre")
-            genre_elem.text = ", ".join(rom["genres"])
-
-        # Players
-        igdb_meta = rom.get("igdb_metadata", {})
-        if igdb_meta.get("game_modes"):
-            players_elem = ET.SubElement(game, "players")
-            modes = igdb_meta["game_modes"]
-            if "Multiplayer" in modes or "Co-operative" in modes:
-                players_elem.text = "4"
-            else:
-                players_elem.text = "1"
-        
-        # Kid game flag
-        rom_id = rom.get("id")
-        if rom_id and rom_id in kid_friendly_rom_ids:
-            kidgame_elem = ET.SubElement(game, "kidgame")
-            kidgame_elem.text = "true"
-
-    return root
-
-
-def prettify_xml(elem: ET.Element) -> str:
-    """Return a pretty-printed XML string."""
-    rough_string = ET.tostring(elem, encoding="unicode")
-    reparsed = minidom.parseString(rough_string)
-    return reparsed.toprettyxml(indent="  ")
+    # Path prefixes are the same for every ROM on the platform
+    if rom_base_path:
+        # Use custom base path (e.g., /romm/library/roms/snes/game.sfc)
+        rom_prefix = f"{rom_base_path}/{retropie_folder}/"
+    else:
+        # Use relative path (e.g., ./game.sfc)
+        rom_prefix = "./"
+    
+    # Build image directory based on target config
+    images_base = os.path.expanduser(target_config["images_path"])
+    image_subdir = target_config["image_subdir"]
+    image_dir = f"{images_base}/{retropie_folder}"
+    if image_subdir:
+        image_dir = f"{image_dir}/{image_subdir}"
+
+    # Write to a temporary file and swap it in at the end, so an interrupted
+    # sync never leaves a truncated gamelist behind
+    part_path = make_temp_file(output_path)
+    try:
+        with open(part_path, "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" ?>\n<gameList>\n')
+            for rom in roms:
+                game = _build_game_element(rom, rom_prefix, image_dir, kid_friendly_rom_ids)
+                _indent_game(game)
+                f.write("  " + ET.tostring(game, encoding="unicode") + "\n")
+            f.write("</gameList>\n")
+        os.replace(part_path, output_path)
+    except BaseException:
+        try:
+            part_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
 
 
 def parse_existing_gamelist(gamelist_path: Path) -> dict:
@@ -509,33 +912,49 @@ def parse_existing_gamelist(gamelist_path: Path) -> dict:
         Dictionary mapping ROM names to their file paths and image paths.
         Format: {rom_name: {'path': str, 'image': str}}
     """
-    if not gamelist_path.exists():
-        return {}
-    
     try:
-        tree = ET.parse(gamelist_path)
-        root = tree.getroot()
-        
         existing_games = {}
-        for game in root.findall('game'):
-            name_elem = game.find('name')
-            path_elem = game.find('path')
-            image_elem = game.find('image')
+        # Stream <game> elements and clear each one once read, so memory stays flat
+        for _, game in ET.iterparse(str(gamelist_path), events=('end',)):
+            if game.tag != 'game':
+                continue
             
-            if name_elem is not None and name_elem.text:
+            name = path = image = None
+            for child in game:
+                if child.tag == 'name':
+                    name = child.text
+                elif child.tag == 'path':
+                    path = child.text
+                elif child.tag == 'image':
+                    image = child.text
+            
+            if name:
                 game_info = {}
-                if path_elem is not None and path_elem.text:
-                    game_info['path'] = path_elem.text
-                if image_elem is not None and image_elem.text:
-                    game_info['image'] = image_elem.text
-                existing_games[name_elem.text] = game_info
+                if path:
+                    game_info['path'] = path
+                if image:
+                    game_info['image'] = image
+                existing_games[name] = game_info
+            game.clear()
         
         return existing_games
-    except Exception as e:
+    except FileNotFoundError:
+        # Nothing synced yet for this platform
+        return {}
+    except (ET.ParseError, OSError) as e:
         print(f"  Warning: Could not parse existing gamelist.xml: {e}")
         return {}
 
 
+def list_dir_names(path: Path) -> set:
+    """Return the set of entry names in a directory (empty if it doesn't exist)."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
 def remove_unfavorited_games(
     current_roms: list,
     existing_games: dict,
@@ -570,6 +989,10 @@ def remove_unfavorited_games(
     removed_roms = 0
     removed_images = 0
     
+    # One directory listing each instead of a stat() per candidate file
+    rom_entries = list_dir_names(roms_path)
+    image_entries = list_dir_names(images_path)
+    
     for game_name, game_info in removed_games.items():
         if dry_run:
             print(f"    [DRY RUN] Would remove: {game_name}")
@@ -583,12 +1006,14 @@ def remove_unfavorited_games(
             # Extract filename from path (handle both relative ./file.ext and absolute paths)
             rom_filename = Path(rom_path_str).name
             rom_file = roms_path / rom_filename
-            if rom_file.exists():
+            if rom_filename in rom_entries:
                 try:
-                    rom_file.unlink()
+                    os.unlink(rom_file)
                     removed_roms += 1
                     logging.info(f"Deleted ROM file: {rom_file}")
                     print(f"      Deleted ROM: {rom_filename}")
+                except FileNotFoundError:
+                    pass
                 except Exception as e:
                     logging.error(f"Error deleting ROM {rom_file}: {e}")
                     print(f"      Error deleting ROM {rom_filename}: {e}")
@@ -599,12 +1024,14 @@ def remove_unfavorited_games(
             # Extract filename from path
             image_filename = Path(image_path_str).name
             image_file = images_path / image_filename
-            if image_file.exists():
+            if image_filename in image_entries:
                 try:
-                    image_file.unlink()
+                    os.unlink(image_file)
                     removed_images += 1
                     logging.info(f"Deleted image file: {image_file}")
                     print(f"      Deleted image: {image_filename}")
+                except FileNotFoundError:
+                    pass
                 except Exception as e:
                     logging.error(f"Error deleting image {image_file}: {e}")
                     print(f"      Error deleting image {image_filename}: {e}")
@@ -612,51 +1039,157 @@ def remove_unfavorited_games(
     return (removed_roms, removed_images)
 
 
-def download_image(client: RomMClient, rom: dict, dest_path: Path, max_retries: int = 3) -> bool:
-    """Download cover image for a ROM with retry logic."""
+class CoverManifest:
+    """SQLite record of downloaded covers: where each came from and its ETag.
+    
+    Rows are keyed by (images directory, ROM ID). A cover whose source (URL or
+    server path) no longer matches its row is re-downloaded even though the
+    file exists, and the stored ETag makes re-checks conditional. Safe to use
+    from several threads.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS covers ("
+                " images_dir TEXT NOT NULL,"
+                " rom_id INTEGER NOT NULL,"
+                " source TEXT,"
+                " etag TEXT,"
+                " PRIMARY KEY (images_dir, rom_id))"
+            )
+
+    def load(self, images_dir: str) -> dict:
+        """Return {rom_id: (source, etag)} for every cover recorded in a directory."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rom_id, source, etag FROM covers WHERE images_dir = ?", (images_dir,)
+            ).fetchall()
+        return {rom_id: (source, etag) for rom_id, source, etag in rows}
+
+    def record(self, images_dir: str, entries: list) -> None:
+        """Store (rom_id, source, etag) entries for a directory in one transaction."""
+        if not entries:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO covers (images_dir, rom_id, source, etag) VALUES (?, ?, ?, ?)",
+                [(images_dir, rom_id, source, etag) for rom_id, source, etag in entries],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def cover_source(rom: dict) -> Optional[str]:
+    """Return what identifies a ROM's cover in RomM (external URL or server path)."""
+    return rom.get("url_cover") or rom.get("path_cover_s") or rom.get("path_cover_l")
+
+
+def download_image(
+    client: RomMClient,
+    rom: dict,
+    dest_path: Path,
+    max_retries: int = 3,
+    etag: str = None,
+    conditional: bool = True,
+    request_limiter: TokenBucket = None,
+) -> Optional[tuple]:
+    """Download cover image for a ROM with retry logic.
+    
+    If the image already exists, the request is made conditional (If-None-Match
+    from the given ETag, If-Modified-Since from the file mtime) so an unchanged
+    cover costs a 304 instead of a full download.
+    
+    Args:
+        client: RomM API client.
+        rom: ROM dictionary from RomM.
+        dest_path: Where the image is saved.
+        max_retries: Number of attempts for transient errors.
+        etag: ETag of the copy on disk, if known.
+        conditional: If False, always download (e.g. the cover's source changed).
+        request_limiter: Optional TokenBucket (in requests) shared by all image
+            downloads; every attempt takes one token.
+    
+    Returns:
+        Tuple of (ETag, changed) once the image is on disk and up to date, where
+        the ETag is "" if the server sent none and changed is False for a 304.
+        None if the image could not be downloaded.
+    """
     url = client.get_cover_url(rom)
     if not url:
-        return False
+        return None
+
+    headers = {}
+    if conditional and dest_path.exists():
+        headers["If-Modified-Since"] = formatdate(dest_path.stat().st_mtime, usegmt=True)
+        if etag:
+            headers["If-None-Match"] = etag
+
+    # Use the authenticated session for local server URLs, the external one otherwise
+    is_local = url.startswith(client.server_url)
+    session = client.cover_session if is_local else client.external_session
+    part_path = None
 
     for attempt in range(max_retries):
+        if request_limiter:
+            request_limiter.consume(1)
         try:
-            # Use session for local server URLs, plain requests for external
-            is_local = url.startswith(client.server_url)
-            if is_local:
-                response = client.session.get(url, timeout=30)
-            else:
-                response = requests.get(url, timeout=30)
-            
-            response.raise_for_status()
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-            dest_path.write_bytes(response.content)
-            logging.info(f"Downloaded image: {dest_path}")
-            return True
+            with session.get(url, timeout=30, headers=headers, stream=True) as response:
+                if response.status_code == 304:
+                    logging.debug(f"Image unchanged: {dest_path}")
+                    return (response.headers.get("ETag", etag or ""), False)
+                response.raise_for_status()
+                
+                # Stream to a temporary file so a failed download never leaves a
+                # truncated cover behind (it would be skipped as existing next time)
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
+                part_path = make_temp_file(dest_path)
+                with open(part_path, "wb") as f:
+                    for chunk in response.iter_content(IMAGE_DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                os.replace(part_path, dest_path)
+            logging.debug(f"Downloaded image: {dest_path}")
+            return (response.headers.get("ETag", ""), True)
         except requests.HTTPError as e:
             if e.response.status_code == 401:
                 # 401 on external URLs means auth required - skip retries
-                if not url.startswith(client.server_url):
-                    return False
+                if not is_local:
+                    return None
                 print(f"  Warning: 401 Auth error for {rom.get('name')} (attempt {attempt + 1}/{max_retries})")
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)
                     continue
             elif e.response.status_code == 404:
                 # 404 means image doesn't exist - no point retrying
-                return False
+                return None
             elif e.response.status_code == 429:
-                print(f"  Warning: Rate limited, waiting...")
-                time.sleep(5 * (attempt + 1))
-                continue
+                if attempt < max_retries - 1:
+                    retry_after = e.response.headers.get("Retry-After", "")
+                    print(f"  Warning: Rate limited, waiting...")
+                    time.sleep(int(retry_after) if retry_after.isdigit() else 5 * (attempt + 1))
+                    continue
+            elif e.response.status_code in (500, 502, 503, 504):
+                # Transient server error: back off and try again
+                if attempt < max_retries - 1:
+                    time.sleep(2 ** attempt)
+                    continue
             else:
-                return False
+                return None
         except requests.RequestException as e:
+            if part_path and part_path.exists():
+                part_path.unlink()
             if attempt < max_retries - 1:
                 time.sleep(1)
                 continue
-            return False
+            return None
     
-    return False
+    return None
 
 
 def sync_platform(
@@ -669,6 +1202,16 @@ def sync_platform(
     rom_base_path: str = None,
     favorites_only: bool = False,
     target_config: dict = None,
+    roms: list = None,
+    refresh_images: bool = False,
+    kid_friendly_rom_ids: frozenset = None,
+    image_workers: int = IMAGE_DOWNLOAD_WORKERS,
+    rom_workers: int = ROM_DOWNLOAD_WORKERS,
+    rate_limiter: TokenBucket = None,
+    request_limiter: TokenBucket = None,
+    manifest: CoverManifest = None,
+    image_slots: threading.Semaphore = None,
+    rom_slots: threading.Semaphore = None,
 ) -> int:
     """Sync a single platform from RomM to RetroPie.
     
@@ -682,6 +1225,23 @@ def sync_platform(
         rom_base_path: Optional base path for ROM files in gamelist.xml.
         favorites_only: If True, only sync ROMs marked as favorites.
         target_config: Target system configuration dict (from TARGET_CONFIGS).
+        roms: Pre-fetched ROMs for this platform. If None, they are fetched here.
+        refresh_images: If True, re-validate existing covers with the server
+            instead of skipping them.
+        kid_friendly_rom_ids: IDs of ROMs in the Kid Friendly collection. If None,
+            they are fetched here.
+        image_workers: Number of cover images to download in parallel.
+        rom_workers: Number of ROM files to download in parallel. With 1, each
+            download shows live progress.
+        rate_limiter: Optional TokenBucket (in bytes) capping ROM download speed.
+        request_limiter: Optional TokenBucket (in requests) capping the cover
+            image request rate.
+        manifest: Optional CoverManifest used to spot changed covers and to
+            make re-checks conditional.
+        image_slots: Optional semaphore shared by all platforms, capping the
+            cover downloads in flight across the whole sync.
+        rom_slots: Optional semaphore shared by all platforms, capping the ROM
+            downloads in flight across the whole sync.
     
     Returns:
         Number of ROMs processed.
@@ -702,10 +1262,15 @@ def sync_platform(
     print(f"  Platform ID: {platform['id']}")
     print(f"  EmulationStation folder: {retropie_folder}")
     print(f"{'='*60}")
+    if retropie_folder not in ES_FOLDERS:
+        print(f"  Warning: No EmulationStation folder mapping for '{platform_slug}', using the slug as-is")
 
-    # Get ROMs for this platform
+    # Get ROMs for this platform (unless the caller already fetched them)
     try:
-        roms_response = client.get_roms(platform["id"], favorites_only=favorites_only)
+        if roms is not None:
+            roms_response = roms
+        else:
+            roms_response = client.get_roms(platform["id"], favorites_only=favorites_only)
         
         # Check if no favorites collection was found
         if isinstance(roms_response, dict) and roms_response.get("_no_favorites_collection"):
@@ -745,28 +1310,28 @@ def sync_platform(
     else:
         print(f"  Found {len(roms)} ROMs")
     
-    # Debug: Show available fields from first ROM
-    if roms:
-        print("\n  DEBUG: Sample ROM data:")
+    # ROMs that have a cover to download (used by the debug output and the image phase)
+    cover_roms = [r for r in roms if r.get('url_cover') or r.get('path_cover_s') or r.get('path_cover_l')]
+    
+    # Debug: Show available fields from first ROM (only with --verbose)
+    if roms and logging.getLogger().isEnabledFor(logging.DEBUG):
         first_rom = roms[0]
-        print(f"    ROM: {first_rom.get('name', 'N/A')}")
-        print(f"    fs_name: '{first_rom.get('fs_name', '')}'")
-        print(f"    favorite: {first_rom.get('favorite', False)}")
-        print(f"    url_cover: {first_rom.get('url_cover')}")
-        print(f"    path_cover_s: {first_rom.get('path_cover_s')}")
-        print(f"    path_cover_l: {first_rom.get('path_cover_l')}")
+        logging.debug(f"Sample ROM data for {platform_slug}:")
+        logging.debug(f"  ROM: {first_rom.get('name', 'N/A')}")
+        logging.debug(f"  fs_name: '{first_rom.get('fs_name', '')}'")
+        logging.debug(f"  favorite: {first_rom.get('favorite', False)}")
+        logging.debug(f"  url_cover: {first_rom.get('url_cover')}")
+        logging.debug(f"  path_cover_s: {first_rom.get('path_cover_s')}")
+        logging.debug(f"  path_cover_l: {first_rom.get('path_cover_l')}")
         
         # Show actual download URL that will be used
         cover_url = client.get_cover_url(first_rom)
         if cover_url:
             is_external = not cover_url.startswith(client.server_url)
             source = "external" if is_external else "local server"
-            print(f"    Download URL ({source}): {cover_url[:80]}..." if len(cover_url) > 80 else f"    Download URL ({source}): {cover_url}")
+            logging.debug(f"  Download URL ({source}): {cover_url[:80]}..." if len(cover_url) > 80 else f"  Download URL ({source}): {cover_url}")
         
-        # Count ROMs with covers
-        roms_with_covers = sum(1 for r in roms if r.get('url_cover') or r.get('path_cover_s') or r.get('path_cover_l'))
-        print(f"    ROMs with covers: {roms_with_covers}/{len(roms)}")
-        print()
+        logging.debug(f"  ROMs with covers: {len(cover_roms)}/{len(roms)}")
 
     if dry_run:
         action_items = []
@@ -833,43 +1398,110 @@ def sync_platform(
         else:
             logging.info(f"Using existing images directory: {images_path}")
         print("  Downloading cover images...")
+        interactive = stdout_is_interactive()
+        progress_interval = PROGRESS_INTERVAL if interactive else PIPED_PROGRESS_INTERVAL
         downloaded = 0
         skipped = 0
+        unchanged = 0
         failed = 0
         auth_errors = 0
         not_found = 0
-        total_with_covers = sum(1 for rom in roms if rom.get("url_cover") or rom.get("path_cover_s") or rom.get("path_cover_l"))
         
-        for i, rom in enumerate(roms):
-            has_cover = rom.get("url_cover") or rom.get("path_cover_s") or rom.get("path_cover_l")
-            if has_cover:
-                # Use ROM filename (without extension) for image name to match ES-DE expectations
-                rom_filename = rom.get("fs_name", "") or rom.get("file_name", "") or rom.get("name", "unknown")
-                rom_filename_base = Path(rom_filename).stem  # Remove extension
-                image_filename = f"{rom_filename_base}.png"
-                image_path = images_path / image_filename
-                if not image_path.exists():
-                    # Show progress counter
-                    current = downloaded + failed + 1
-                    print(f"\r    Downloading image {current}/{total_with_covers}: {rom.get('name', 'Unknown')[:50]}...", end='', flush=True)
-                    
-                    if download_image(client, rom, image_path):
-                        downloaded += 1
+        # Collect covers that are missing on disk, whose source changed since they
+        # were downloaded, or all of them when refreshing. Existence is checked
+        # against one directory listing instead of a stat() per ROM
+        existing_images = list_dir_names(images_path)
+        images_key = str(images_path)
+        known_covers = manifest.load(images_key) if manifest else {}
+        pending = []
+        queued = set()
+        for rom in cover_roms:
+            # Use ROM filename (without extension) for image name to match ES-DE
+            # expectations, with the same fallbacks as write_gamelist_xml
+            rom_get = rom.get
+            rom_filename = rom_get("fs_name") or rom_get("file_name") or rom_get("name") or "Unknown"
+            image_filename = cover_image_name(rom_filename)
+            if image_filename in queued:
+                # Another ROM with the same stem (game.zip and game.7z) already
+                # owns this cover
+                skipped += 1
+                continue
+            queued.add(image_filename)
+            source = cover_source(rom)
+            if manifest and rom_get("id") not in known_covers:
+                # Nothing says where a cover on disk came from (e.g. it predates
+                # the manifest), so fetch it once unconditionally and record it
+                known_etag, source_changed = None, True
+            else:
+                known_source, known_etag = known_covers.get(rom_get("id"), (source, None))
+                source_changed = known_source != source
+            if refresh_images or source_changed or image_filename not in existing_images:
+                pending.append((rom, images_path / image_filename, known_etag, not source_changed))
+            else:
+                skipped += 1
+        
+        # Temp files left behind by an interrupted run. Platforms sharing this
+        # folder never sync at the same time, so none of them is in use
+        for name in existing_images:
+            if name.endswith(".part"):
+                try:
+                    os.unlink(images_path / name)
+                except FileNotFoundError:
+                    pass
+        
+        # Download them in parallel; each download is almost entirely network wait,
+        # and the bounded worker pool (and image_slots, across platforms) caps
+        # concurrent requests on the server. request_limiter, if set, caps their
+        # rate as well
+        if pending:
+            fetched = []
+            with ThreadPoolExecutor(max_workers=max(1, image_workers)) as executor:
+                futures = {
+                    executor.submit(
+                        run_collected, run_in_slot, image_slots, download_image, client, rom, image_path,
+                        etag=etag, conditional=conditional, request_limiter=request_limiter,
+                    ): rom
+                    for rom, image_path, etag, conditional in pending
+                }
+                last_progress = 0.0
+                for future in as_completed(futures):
+                    result, messages = future.result()
+                    if messages:
+                        # Start the worker's warnings on a fresh line
+                        if interactive and last_progress:
+                            print()
+                        print(messages, end='')
+                    if result is not None:
+                        etag, changed = result
+                        if changed:
+                            downloaded += 1
+                        else:
+                            unchanged += 1
+                        rom = futures[future]
+                        fetched.append((rom.get("id"), cover_source(rom), etag))
                     else:
                         failed += 1
                     
-                    # Rate limiting: small delay every 10 downloads
-                    if (i + 1) % 10 == 0:
-                        time.sleep(0.5)
-                else:
-                    skipped += 1
+                    # Show progress counter (throttled, but always show the last one)
+                    current = downloaded + unchanged + failed
+                    now = time.monotonic()
+                    if now - last_progress >= progress_interval or current == len(pending):
+                        last_progress = now
+                        print_progress(
+                            f"    Downloading image {current}/{len(pending)}: {(futures[future].get('name') or 'Unknown')[:50]}...",
+                            interactive,
+                        )
         
-        if downloaded > 0 or failed > 0:
+            if manifest:
+                manifest.record(images_key, fetched)
+        
+        if interactive and pending:
             print()  # New line after progress
-        print(f"  Downloaded {downloaded} cover images (skipped {skipped} existing, {failed} failed)")
+        unchanged_note = f", {unchanged} unchanged" if unchanged else ""
+        print(f"  Downloaded {downloaded} cover images (skipped {skipped} existing{unchanged_note}, {failed} failed)")
         if failed > 0:
             print(f"  Note: {failed} images failed to download (check auth or network issues)")
-        if downloaded == 0 and failed == 0 and skipped == 0:
+        if downloaded == 0 and unchanged == 0 and failed == 0 and skipped == 0:
             print("  WARNING: No ROMs have cover images available")
 
     # Download ROM files
@@ -884,32 +1516,56 @@ def sync_platform(
         downloaded = 0
         skipped = 0
         failed = 0
-        total_roms = len(roms)
         
-        for idx, rom in enumerate(roms, 1):
+        # Collect ROM files that are missing on disk
+        existing_roms = list_dir_names(roms_path)
+        pending = []
+        for rom in roms:
             fs_name = rom.get('fs_name')
             if not fs_name:
                 failed += 1
                 continue
             
-            dest_path = roms_path / fs_name
-            
-            # Skip if already exists
-            if dest_path.exists():
+            # Skip if already exists (or is already queued under the same name)
+            if fs_name in existing_roms:
                 skipped += 1
                 continue
             
-            # Download ROM file
-            print(f"    [{idx}/{total_roms}] Downloading {fs_name}...")
-            if client.download_rom_file(rom, dest_path):
-                downloaded += 1
-            else:
-                failed += 1
+            existing_roms.add(fs_name)
+            pending.append((rom, roms_path / fs_name))
+        
+        if rom_workers <= 1:
+            # One at a time, with a live progress line per file
+            for idx, (rom, dest_path) in enumerate(pending, 1):
+                print(f"    [{idx}/{len(pending)}] Downloading {rom['fs_name']}...")
+                if run_in_slot(rom_slots, client.download_rom_file, rom, dest_path, rate_limiter=rate_limiter):
+                    downloaded += 1
+                else:
+                    failed += 1
+        elif pending:
+            # Several streams at once; progress lines would interleave, so
+            # report each file as it completes instead
+            done = 0
+            with ThreadPoolExecutor(max_workers=rom_workers) as executor:
+                futures = {
+                    executor.submit(run_collected, run_in_slot, rom_slots, client.download_rom_file, rom, dest_path, False, rate_limiter): rom
+                    for rom, dest_path in pending
+                }
+                for future in as_completed(futures):
+                    done += 1
+                    ok, messages = future.result()
+                    print(messages, end='')
+                    if ok:
+                        downloaded += 1
+                        print(f"    [{done}/{len(pending)}] Downloaded {futures[future]['fs_name']}")
+                    else:
+                        failed += 1
         
         print(f"  Downloaded {downloaded} ROM files (skipped {skipped} existing, {failed} failed)")
     
-    # Get kid friendly ROM IDs
-    kid_friendly_rom_ids = client.get_kid_friendly_rom_ids()
+    # Get kid friendly ROM IDs (unless the caller already fetched them)
+    if kid_friendly_rom_ids is None:
+        kid_friendly_rom_ids = client.get_kid_friendly_rom_ids()
     if kid_friendly_rom_ids:
         kid_count = sum(1 for rom in roms if rom.get('id') in kid_friendly_rom_ids)
         if kid_count > 0:
@@ -917,17 +1573,100 @@ def sync_platform(
     
     # Generate gamelist.xml
     print("  Generating gamelist.xml...")
-    gamelist = create_gamelist_xml(roms, platform_slug, retropie_folder, rom_base_path, kid_friendly_rom_ids, target_config)
     gamelist_path = platform_path / "gamelist.xml"
-
-    xml_content = prettify_xml(gamelist)
-    gamelist_path.write_text(xml_content, encoding="utf-8")
+    write_gamelist_xml(roms, platform_slug, retropie_folder, gamelist_path, rom_base_path, kid_friendly_rom_ids, target_config)
     logging.info(f"Created gamelist.xml: {gamelist_path}")
     print(f"  Wrote {gamelist_path}")
 
     return len(roms)
 
 
+class ThreadOutput:
+    """sys.stdout replacement that lets worker threads buffer their output.
+    
+    A thread that calls capture() writes to its own buffer until release();
+    all other threads write straight through to the wrapped stream. This keeps
+    the output of platforms synced in parallel from interleaving.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        """Start buffering output written by the current thread."""
+        self._local.buffer = io.StringIO()
+
+    def release(self) -> str:
+        """Stop buffering for the current thread and return what it wrote."""
+        buffer = self._local.buffer
+        self._local.buffer = None
+        return buffer.getvalue()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            return self.stream.write(text)
+        return buffer.write(text)
+
+    def flush(self):
+        if getattr(self._local, "buffer", None) is None:
+            self.stream.flush()
+
+    def isatty(self) -> bool:
+        # Buffered output is printed later in one go, so it is never interactive
+        if getattr(self._local, "buffer", None) is not None:
+            return False
+        return self.stream.isatty()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def run_buffered(output: ThreadOutput, func, *args, **kwargs) -> tuple:
+    """Call `func` with its printed output captured.
+    
+    Args:
+        output: ThreadOutput installed as sys.stdout.
+        func: Function to call, e.g. one that syncs some platforms.
+        *args, **kwargs: Passed through to func.
+    
+    Returns:
+        Tuple of (func's return value, captured output).
+    """
+    output.capture()
+    try:
+        count = func(*args, **kwargs)
+    except BaseException:
+        # Don't lose the context leading up to the error
+        output.stream.write(output.release())
+        raise
+    return (count, output.release())
+
+
+def run_in_slot(slot: Optional[threading.Semaphore], func, *args, **kwargs):
+    """Call `func` while holding `slot` (if given), and return its result."""
+    if slot is None:
+        return func(*args, **kwargs)
+    with slot:
+        return func(*args, **kwargs)
+
+
+def run_collected(func, *args, **kwargs) -> tuple:
+    """Call `func` from a worker thread, collecting what it prints.
+    
+    The caller prints the collected text from its own thread, so warnings from
+    download workers end up with the platform they belong to (and inside its
+    buffer when platforms are synced in parallel).
+    
+    Returns:
+        Tuple of (func's return value, printed output).
+    """
+    if isinstance(sys.stdout, ThreadOutput):
+        return run_buffered(sys.stdout, func, *args, **kwargs)
+    return (func(*args, **kwargs), "")
+
+
 def detect_esde_paths() -> dict:
     """Detect ROM and media paths from ES-DE settings.
     
@@ -943,17 +1682,18 @@ def detect_esde_paths() -> dict:
     result = {}
     
     try:
-        content = esde_settings.read_text()
+        # A stray non-UTF-8 byte elsewhere in the file shouldn't hide the paths
+        content = esde_settings.read_text(errors="replace")
         
         # Look for ROMDirectory
-        match = re.search(r'<string name="ROMDirectory" value="([^"]+)"', content)
+        match = ESDE_ROM_DIRECTORY_RE.search(content)
         if match:
             roms_path = match.group(1)
             print(f"  Found ROMDirectory in ES-DE settings: {roms_path}")
             result['roms_path'] = roms_path
         
         # Look for MediaDirectory
-        match = re.search(r'<string name="MediaDirectory" value="([^"]+)"', content)
+        match = ESDE_MEDIA_DIRECTORY_RE.search(content)
         if match:
             media_path = match.group(1)
             print(f"  Found MediaDirectory in ES-DE settings: {media_path}")
@@ -1032,6 +1772,11 @@ Examples:
         action="store_true",
         help="Skip downloading cover images",
     )
+    parser.add_argument(
+        "--refresh-images",
+        action="store_true",
+        help="Re-check existing cover images with the server and download only those that changed",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -1056,16 +1801,72 @@ Examples:
         action="store_true",
         help="Download ROM files from RomM server (uses target default path or --rom-path if specified)",
     )
+    parser.add_argument(
+        "--max-concurrent-downloads",
+        type=int,
+        default=ROM_DOWNLOAD_WORKERS,
+        help=f"Number of ROM files to download in parallel, across all platforms (default: {ROM_DOWNLOAD_WORKERS}). Use 1 for live per-file progress",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=0,
+        metavar="BYTES_PER_SEC",
+        help="Cap the combined ROM download speed in bytes per second (default: unlimited)",
+    )
     parser.add_argument(
         "--no-auto-detect",
         action="store_true",
         help="Disable auto-detection of EmuDeck paths and use standard ES-DE default paths",
     )
+    parser.add_argument(
+        "--max-rps",
+        type=float,
+        default=0,
+        metavar="REQUESTS_PER_SEC",
+        help="Cap the combined rate of cover image requests per second (default: unlimited)",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=None,
+        help="Number of cover image requests allowed back-to-back before --max-rps applies (default: same as --max-rps)",
+    )
+    parser.add_argument(
+        "--image-workers",
+        type=int,
+        default=IMAGE_DOWNLOAD_WORKERS,
+        help=f"Number of cover images to download in parallel, across all platforms (default: {IMAGE_DOWNLOAD_WORKERS})",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=ROM_PAGE_SIZE,
+        help=f"Number of ROMs fetched per API request when syncing all platforms (default: {ROM_PAGE_SIZE})",
+    )
+    parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Show debug output (API queries, sample ROM data, per-image downloads)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=PLATFORM_SYNC_WORKERS,
+        help=f"Number of platforms to sync in parallel (default: {PLATFORM_SYNC_WORKERS}). Download limits (--image-workers, --max-concurrent-downloads) are shared, not multiplied. Use 1 for live, sequential output",
+    )
 
     args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    # Route stdout (and so the console log) through ThreadOutput, so platforms
+    # synced in parallel and their download workers can buffer what they print
+    output = ThreadOutput(sys.stdout)
+    sys.stdout = output
 
     # Setup logging
-    setup_logging()
+    setup_logging(verbose=args.verbose)
 
     # Get target configuration (make a copy so we can modify it)
     target_config = TARGET_CONFIGS[args.target].copy()
@@ -1157,19 +1958,110 @@ Examples:
     else:
         print("\n** WARNING: Syncing ALL ROMs (this may take a while) **\n")
     
-    for platform in platforms:
-        count = sync_platform(
-            client,
-            platform,
-            gamelist_path,
-            download_images=not args.no_images,
-            download_roms=args.download_roms,
-            dry_run=args.dry_run,
-            rom_base_path=args.rom_path,
-            favorites_only=favorites_only,
-            target_config=target_config,
+    # When syncing every platform, fetch the library in one paged pass instead
+    # of one request per platform
+    roms_by_platform = None
+    if not args.platforms:
+        try:
+            roms_by_platform = client.get_all_roms_grouped(favorites_only=favorites_only, page_size=args.batch_size)
+        except requests.RequestException as e:
+            print(f"Error fetching ROMs: {e}")
+            sys.exit(1)
+    
+    # The Kid Friendly collection is the same for every platform, so look it up once
+    kid_friendly_rom_ids = frozenset()
+    if not args.dry_run:
+        try:
+            kid_friendly_rom_ids = client.get_kid_friendly_rom_ids()
+        except requests.RequestException as e:
+            print(f"Error fetching Kid Friendly collection: {e}")
+            sys.exit(1)
+    
+    # Remember where each cover came from, so changed covers are picked up
+    manifest = None
+    if not args.no_images and not args.dry_run:
+        try:
+            manifest = CoverManifest(Path.home() / "romm-sync" / "manifest.db")
+        except sqlite3.Error as e:
+            print(f"Warning: Could not open cover manifest, changed covers won't be detected: {e}")
+    
+    sync_options = {
+        "download_images": not args.no_images,
+        "download_roms": args.download_roms,
+        "dry_run": args.dry_run,
+        "rom_base_path": args.rom_path,
+        "favorites_only": favorites_only,
+        "target_config": target_config,
+        "refresh_images": args.refresh_images,
+        "kid_friendly_rom_ids": kid_friendly_rom_ids,
+        "image_workers": args.image_workers,
+        "rom_workers": args.max_concurrent_downloads,
+        "rate_limiter": TokenBucket(args.rate_limit) if args.rate_limit else None,
+        "request_limiter": TokenBucket(args.max_rps, args.burst) if args.max_rps > 0 else None,
+        "manifest": manifest,
+        # Platform workers each run their own download pools; these caps keep
+        # the total in flight at --image-workers covers and
+        # --max-concurrent-downloads ROMs however many platforms run at once
+        "image_slots": threading.BoundedSemaphore(max(1, args.image_workers)),
+        "rom_slots": threading.BoundedSemaphore(max(1, args.max_concurrent_downloads)),
+    }
+
+    def platform_roms(platform):
+        return roms_by_platform.get(platform["id"], []) if roms_by_platform is not None else None
+
+    def sync_group(group):
+        return sum(
+            sync_platform(client, platform, gamelist_path, roms=platform_roms(platform), **sync_options)
+            for platform in group
         )
-        total_roms += count
+
+    # Several RomM platforms map to one folder (e.g. snes and super-famicom). They
+    # write the same gamelist and images, so they must never run at once
+    folder_groups = {}
+    for platform in platforms:
+        slug = platform.get("slug", "")
+        folder_groups.setdefault(PLATFORM_MAP.get(slug, slug), []).append(platform)
+    groups = list(folder_groups.values())
+
+    if args.workers > 1 and len(groups) > 1:
+        # Folders are independent and mostly waiting on the network, so sync
+        # them in parallel. Each one's output is buffered and printed in platform
+        # order, as soon as it and every folder before it have finished
+        with ThreadPoolExecutor(max_workers=min(args.workers, len(groups))) as executor:
+            futures = [executor.submit(run_buffered, output, sync_group, group) for group in groups]
+            for future in futures:
+                count, text = future.result()
+                output.stream.write(text)
+                output.stream.flush()
+                total_roms += count
+    elif roms_by_platform is not None:
+        for platform in platforms:
+            total_roms += sync_platform(
+                client, platform, gamelist_path, roms=platform_roms(platform), **sync_options
+            )
+    else:
+        # Sequential sync of selected platforms: fetch the next platform's ROM
+        # list in the background while the current one downloads
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            def prefetch(platform):
+                return prefetcher.submit(client.get_roms, platform["id"], favorites_only=favorites_only)
+            
+            next_roms = prefetch(platforms[0])
+            for index, platform in enumerate(platforms):
+                roms_future = next_roms
+                if index + 1 < len(platforms):
+                    next_roms = prefetch(platforms[index + 1])
+                try:
+                    roms = roms_future.result()
+                except requests.RequestException:
+                    # Let sync_platform retry and report the error itself
+                    roms = None
+                total_roms += sync_platform(
+                    client, platform, gamelist_path, roms=roms, **sync_options
+                )
+
+    if manifest:
+        manifest.close()
 
     print(f"\n{'='*60}")
     print(f"Sync complete! Processed {total_roms} ROMs across {len(platforms)} platforms")
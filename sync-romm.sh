@@ -56,11 +56,13 @@ run_sync() {
     # Clear the log file
     > /tmp/romm-sync.log
     
-    # Run sync in background and show live tail
+    # Run sync in background and show live tail (one platform at a time, so
+    # the output streams live instead of arriving per platform)
     python3 -u "$SCRIPT_DIR/romm_sync.py" \
         -s "$ROMM_SERVER" \
         -u "$ROMM_USER" \
         -p "$ROMM_PASSWORD" \
+        --workers 1 \
         $args >> /tmp/romm-sync.log 2>&1 &
     
     local sync_pid=$!
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Fake requests sessions and responses shared by the download tests.
+"""
+
+import io
+
+import requests
+
+
+class FakeResponse:
+    """Minimal streamed response, usable as a context manager like requests'."""
+    
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.content = body
+        self.headers = {"content-length": str(len(body)), **(headers or {})}
+        self.raw = io.BytesIO(body)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+    
+    def iter_content(self, chunk_size):
+        yield self.body
+    
+    def close(self):
+        pass
+
+
+class RangeSession:
+    """Session that serves `content`, honouring Range/If-Range like a web server.
+    
+    `range_skew` shifts the range actually served, to mimic a misbehaving server.
+    """
+    
+    def __init__(self, content, etag='"v1"', range_skew=0):
+        self.content = content
+        self.etag = etag
+        self.range_skew = range_skew
+        self.requests = []
+    
+    def get(self, url, stream=False, timeout=None, headers=None):
+        headers = headers or {}
+        rng = headers.get("Range")
+        self.requests.append((rng, headers.get("If-Range")))
+        if rng and headers.get("If-Range") == self.etag:
+            start = int(rng[len("bytes="):-1]) + self.range_skew
+            if start >= len(self.content):
+                return FakeResponse(416)
+            content_range = f"bytes {start}-{len(self.content) - 1}/{len(self.content)}"
+            return FakeResponse(206, self.content[start:], {"ETag": self.etag, "Content-Range": content_range})
+        return FakeResponse(200, self.content, {"ETag": self.etag})
+
+
+class ConditionalSession:
+    """Session that answers a matching If-None-Match with 304, anything else with 200.
+    
+    With `status` set, every request gets that status instead (e.g. 503).
+    """
+    
+    def __init__(self, etag='"v1"', body=b"new cover", status=None):
+        self.etag = etag
+        self.body = body
+        self.status = status
+        self.headers = []
+    
+    def get(self, url, timeout=None, headers=None, stream=False):
+        self.headers.append(headers)
+        if self.status:
+            return FakeResponse(self.status)
+        if headers and headers.get("If-None-Match") == self.etag:
+            return FakeResponse(304, headers={"ETag": self.etag})
+        return FakeResponse(200, self.body, {"ETag": self.etag})
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Unit tests for RomMClient helpers that don't need a live server.
+"""
+
+from romm_sync import RomMClient
+
+from fakes import RangeSession
+
+
+def make_client(roms, total=None):
+    """Create a client whose get_roms pages through an in-memory ROM list."""
+    client = RomMClient("http://romm.local", "user", "password")
+    calls = []
+    
+    def fake_get_roms(platform_id=None, limit=1000, favorites_only=False, collection_id=None, offset=0):
+        calls.append(offset)
+        return {"items": roms[offset:offset + limit], "total": len(roms) if total is None else total}
+    
+    client.get_roms = fake_get_roms
+    return client, calls
+
+
+class TestGetAllRomsGrouped:
+    """Tests for RomMClient.get_all_roms_grouped."""
+    
+    def test_groups_all_pages_by_platform(self):
+        """Test every page is fetched and ROMs are grouped in order."""
+        roms = [{"id": i, "platform_id": i % 2} for i in range(10)]
+        client, calls = make_client(roms)
+        
+        grouped = client.get_all_roms_grouped(page_size=3)
+        
+        assert sorted(calls) == [0, 3, 6, 9]
+        assert [r["id"] for r in grouped[0]] == [0, 2, 4, 6, 8]
+        assert [r["id"] for r in grouped[1]] == [1, 3, 5, 7, 9]
+    
+    def test_single_page(self):
+        """Test no extra requests are made when the first page has everything."""
+        roms = [{"id": 1, "platform_id": 5}]
+        client, calls = make_client(roms)
+        
+        grouped = client.get_all_roms_grouped(page_size=100)
+        
+        assert calls == [0]
+        assert grouped == {5: roms}
+    
+    def test_no_favorites_collection(self):
+        """Test None is returned when there is no Favourites collection."""
+        client = RomMClient("http://romm.local", "user", "password")
+        client.get_roms = lambda **kwargs: {"items": [], "total": 0, "_no_favorites_collection": True}
+        
+        assert client.get_all_roms_grouped(favorites_only=True) is None
+
+
+class TestDownloadRomFile:
+    """Tests for RomMClient.download_rom_file."""
+    
+    ROM = {"id": 1, "fs_name": "game.zip"}
+    
+    def make_client(self, session):
+        client = RomMClient("http://romm.local", "user", "password")
+        client.session = session
+        return client
+    
+    def write_partial(self, tmp_path, data, validator='"v1"'):
+        (tmp_path / "game.zip.part").write_bytes(data)
+        if validator is not None:
+            (tmp_path / "game.zip.part.validator").write_text(validator)
+    
+    def test_fresh_download(self, tmp_path):
+        """Test the file is written in full and no temp files are left."""
+        session = RangeSession(b"0123456789")
+        dest = tmp_path / "game.zip"
+        
+        assert self.make_client(session).download_rom_file(self.ROM, dest, show_progress=False)
+        
+        assert dest.read_bytes() == b"0123456789"
+        assert [p.name for p in tmp_path.iterdir()] == ["game.zip"]
+        assert session.requests == [(None, None)]
+    
+    def test_resumes_partial_download(self, tmp_path):
+        """Test a leftover .part file is resumed with Range and If-Range."""
+        session = RangeSession(b"0123456789")
+        dest = tmp_path / "game.zip"
+        self.write_partial(tmp_path, b"0123")
+        
+        assert self.make_client(session).download_rom_file(self.ROM, dest, show_progress=False)
+        
+        assert dest.read_bytes() == b"0123456789"
+        assert session.requests == [("bytes=4-", '"v1"')]
+        assert [p.name for p in tmp_path.iterdir()] == ["game.zip"]
+    
+    def test_changed_rom_is_downloaded_in_full(self, tmp_path):
+        """Test a .part file from an older version of the ROM is not resumed."""
+        session = RangeSession(b"abcdefghij", etag='"v2"')
+        dest = tmp_path / "game.zip"
+        self.write_partial(tmp_path, b"0123", validator='"v1"')
+        
+        assert self.make_client(session).download_rom_file(self.ROM, dest, show_progress=False)
+        
+        assert dest.read_bytes() == b"abcdefghij"
+    
+    def test_partial_without_validator_starts_over(self, tmp_path):
+        """Test a .part file of unknown version is downloaded again without Range."""
+        session = RangeSession(b"0123456789")
+        dest = tmp_path / "game.zip"
+        self.write_partial(tmp_path, b"xxxx", validator=None)
+        
+        assert self.make_client(session).download_rom_file(self.ROM, dest, show_progress=False)
+        
+        assert dest.read_bytes() == b"0123456789"
+        assert session.requests == [(None, None)]
+    
+    def test_wrong_content_range_starts_over(self, tmp_path):
+        """Test a 206 that doesn't start at the partial file's size is not appended."""
+        session = RangeSession(b"0123456789", range_skew=2)
+        dest = tmp_path / "game.zip"
+        self.write_partial(tmp_path, b"0123")
+        
+        assert self.make_client(session).download_rom_file(self.ROM, dest, show_progress=False)
+        
+        assert dest.read_bytes() == b"0123456789"
+        assert session.requests == [("bytes=4-", '"v1"'), (None, None)]
+    
+    def test_oversized_partial_starts_over(self, tmp_path):
+        """Test a .part file larger than the ROM is discarded."""
+        session = RangeSession(b"0123")
+        dest = tmp_path / "game.zip"
+        self.write_partial(tmp_path, b"0123456789")
+        
+        assert self.make_client(session).download_rom_file(self.ROM, dest, show_progress=False)
+        
+        assert dest.read_bytes() == b"0123"
+        assert session.requests == [("bytes=10-", '"v1"'), (None, None)]
+
+
+class TestGetKidFriendlyRomIds:
+    """Tests for RomMClient.get_kid_friendly_rom_ids."""
+    
+    def test_unexpected_response_is_cached(self):
+        """Test an unexpected response gives an empty frozenset that is cached."""
+        client = RomMClient("http://romm.local", "user", "password")
+        client.get_kid_friendly_collection_id = lambda: 2
+        calls = []
+        
+        def fake_get_roms(**kwargs):
+            calls.append(kwargs)
+            return None
+        
+        client.get_roms = fake_get_roms
+        
+        assert client.get_kid_friendly_rom_ids() == frozenset()
+        assert isinstance(client.get_kid_friendly_rom_ids(), frozenset)
+        assert len(calls) == 1
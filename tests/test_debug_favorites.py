@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the debug-favorites.py troubleshooting script.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from fakes import FakeResponse
+
+SCRIPT = Path(__file__).resolve().parent.parent / "debug-favorites.py"
+spec = importlib.util.spec_from_file_location("debug_favorites", SCRIPT)
+debug_favorites = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(debug_favorites)
+
+SERVER = "http://romm.test"
+
+
+class FakeApiSession:
+    """Session that answers the RomM collections, platforms and ROM endpoints."""
+    
+    def __init__(self, collections, favorites_total=3, platforms=()):
+        self.collections = collections
+        self.favorites_total = favorites_total
+        self.platforms = list(platforms)
+        self.requests = []
+        self.auth = None
+        self.headers = {}
+        self.hooks = {"response": []}
+    
+    def mount(self, prefix, adapter):
+        pass
+    
+    def head(self, url, timeout=None):
+        pass
+    
+    def get(self, url, params=None, timeout=None):
+        params = params or {}
+        self.requests.append((url, params))
+        if url.endswith("/api/collections"):
+            name = params.get("name")
+            data = [c for c in self.collections if name is None or c["name"] == name]
+        elif url.endswith("/api/platforms"):
+            data = self.platforms
+        else:
+            total = self.favorites_total if "collection_id" in params else 10
+            data = {"items": [{"id": i} for i in range(min(total, params.get("limit", 50)))], "total": total}
+        return FakeResponse(200, json.dumps(data).encode("utf-8"))
+    
+    def collection_requests(self):
+        return [params for url, params in self.requests if url.endswith("/api/collections")]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk cache inside the test's temporary directory."""
+    monkeypatch.setattr(debug_favorites, "CACHE_DIR", tmp_path / "romm-cache")
+    return tmp_path / "romm-cache"
+
+
+def run_main(monkeypatch, capsys, session, *args):
+    """Run main() against session and return (exit status, JSON summary)."""
+    monkeypatch.setattr(debug_favorites.requests, "Session", lambda: session)
+    monkeypatch.setattr(sys, "argv", ["debug-favorites.py", SERVER, "user", "pass", "--json", *args])
+    status = debug_favorites.main()
+    return status, json.loads(capsys.readouterr().out)
+
+
+class TestCache:
+    """Tests for the on-disk metadata cache."""
+    
+    def test_cache_hit(self):
+        """Test a value written to the cache is read back within its TTL."""
+        debug_favorites.cache_write(["key"], {"id": 7})
+        
+        assert debug_favorites.cache_read(["key"], ttl=300) == {"id": 7}
+    
+    def test_cache_expired(self):
+        """Test an entry older than the TTL is ignored."""
+        debug_favorites.cache_write(["key"], {"id": 7})
+        old = time.time() - 600
+        os.utime(debug_favorites._cache_path(["key"]), (old, old))
+        
+        assert debug_favorites.cache_read(["key"], ttl=300) is None
+    
+    def test_zero_ttl_skips_cache(self):
+        """Test a TTL of 0 never returns a cached value."""
+        debug_favorites.cache_write(["key"], {"id": 7})
+        
+        assert debug_favorites.cache_read(["key"], ttl=0) is None
+    
+    def test_cached_get_reuses_response(self):
+        """Test cached_get only hits the server once within the TTL."""
+        session = FakeApiSession([{"id": 1, "name": "Favourites"}])
+        url = f"{SERVER}/api/collections"
+        
+        first = debug_favorites.cached_get(session, url, {"name": "Favourites"})
+        second = debug_favorites.cached_get(session, url, {"name": "Favourites"})
+        
+        assert first == second == [{"id": 1, "name": "Favourites"}]
+        assert len(session.requests) == 1
+    
+    def test_cached_get_zero_ttl_refetches(self):
+        """Test cached_get with a TTL of 0 always fetches fresh data."""
+        session = FakeApiSession([{"id": 1, "name": "Favourites"}])
+        url = f"{SERVER}/api/collections"
+        
+        debug_favorites.cached_get(session, url, ttl=0)
+        debug_favorites.cached_get(session, url, ttl=0)
+        
+        assert len(session.requests) == 2
+
+
+class TestUnpack:
+    """Tests for unpack."""
+    
+    def test_bare_list(self):
+        """Test a bare list is its own item count."""
+        assert debug_favorites.unpack([{"id": 1}, {"id": 2}]) == ([{"id": 1}, {"id": 2}], 2)
+    
+    def test_paginated_response(self):
+        """Test the paginated response reports the server's total."""
+        data = {"items": [{"id": 1}], "total": 40}
+        
+        assert debug_favorites.unpack(data) == ([{"id": 1}], 40)
+
+
+class TestMain:
+    """Tests for the script's exit codes and JSON summary."""
+    
+    def test_json_summary(self, monkeypatch, capsys):
+        """Test the JSON summary reports the collection, platforms and totals."""
+        session = FakeApiSession(
+            [{"id": 5, "name": "Favourites"}, {"id": 6, "name": "RPGs"}],
+            favorites_total=3,
+            platforms=[{"id": 1, "name": "SNES"}, {"id": 2, "name": "N64"}],
+        )
+        
+        status, summary = run_main(monkeypatch, capsys, session, "--per-platform")
+        
+        assert status == 0
+        assert set(summary) == {"server", "matched_collections", "platforms", "favorites", "errors"}
+        assert summary["server"] == SERVER
+        assert summary["matched_collections"] == 1
+        assert summary["platforms"] == 2
+        assert summary["favorites"]["id"] == 5
+        assert summary["favorites"]["total"] == 3
+        assert summary["favorites"]["per_platform"] == [
+            {"name": "SNES", "total": 3},
+            {"name": "N64", "total": 3},
+        ]
+        assert summary["errors"] == []
+    
+    def test_falls_back_to_full_collection_list(self, monkeypatch, capsys):
+        """Test a differently spelled collection is found in the unfiltered list."""
+        session = FakeApiSession([{"id": 9, "name": "My Favourites"}])
+        
+        status, summary = run_main(monkeypatch, capsys, session)
+        
+        assert status == 0
+        assert summary["matched_collections"] == 0
+        assert summary["favorites"]["id"] == 9
+        assert session.collection_requests() == [{"name": "Favourites"}, {}]
+    
+    def test_missing_favorites_collection(self, monkeypatch, capsys):
+        """Test a library without a Favourites collection exits with EXIT_ERROR."""
+        session = FakeApiSession([{"id": 6, "name": "RPGs"}])
+        
+        status, summary = run_main(monkeypatch, capsys, session)
+        
+        assert status == debug_favorites.EXIT_ERROR
+        assert summary["favorites"]["id"] is None
+        assert summary["errors"] == ["No Favourites collection found"]
+    
+    def test_over_api_limit(self, monkeypatch, capsys):
+        """Test more than 1000 favorites exits with EXIT_OVER_LIMIT."""
+        session = FakeApiSession([{"id": 5, "name": "Favourites"}], favorites_total=1001)
+        
+        status, summary = run_main(monkeypatch, capsys, session)
+        
+        assert status == debug_favorites.EXIT_OVER_LIMIT
+        assert summary["favorites"]["total"] == 1001
+    
+    def test_favorites_id_is_cached(self, monkeypatch, capsys):
+        """Test a second run reuses the cached Favourites collection ID."""
+        session = FakeApiSession([{"id": 5, "name": "Favourites"}])
+        
+        run_main(monkeypatch, capsys, session)
+        status, summary = run_main(monkeypatch, capsys, session)
+        
+        assert status == 0
+        assert summary["favorites"]["id"] == 5
+        assert len(session.collection_requests()) == 1
+    
+    def test_no_cache_refetches_collections(self, monkeypatch, capsys):
+        """Test --no-cache looks the collection up again on every run."""
+        session = FakeApiSession([{"id": 5, "name": "Favourites"}])
+        
+        run_main(monkeypatch, capsys, session, "--no-cache")
+        status, summary = run_main(monkeypatch, capsys, session, "--no-cache")
+        
+        assert status == 0
+        assert summary["matched_collections"] == 1
+        assert len(session.collection_requests()) == 2
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Unit tests for gamelist.xml generation.
+"""
+
+import pytest
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import xml.etree.ElementTree as ET
+from pathlib import Path
+import romm_sync
+from romm_sync import cover_image_name, format_date, parse_existing_gamelist, write_gamelist_xml
+
+
+class TestFormatDate:
+    """Tests for format_date function."""
+    
+    def test_format_utc_date(self):
+        """Test ISO dates with a trailing Z are converted."""
+        assert format_date('1991-08-23T00:00:00Z') == '19910823T000000'
+    
+    def test_format_offset_date(self):
+        """Test ISO dates with an explicit offset are converted."""
+        assert format_date('2001-11-15T12:30:45+00:00') == '20011115T123045'
+    
+    def test_format_invalid_date(self):
+        """Test missing or unparseable dates give an empty string."""
+        assert format_date(None) == ''
+        assert format_date('') == ''
+        assert format_date('not a date') == ''
+        assert format_date(12345) == ''
+
+
+class TestCoverImageName:
+    """Tests for cover_image_name function."""
+    
+    def test_matches_path_stem(self):
+        """Test the name matches Path(...).stem for typical ROM file names."""
+        for filename in ['game.zip', 'Super Mario World (USA).sfc', 'game.tar.gz', 'Super Mario Bros. 3', '.hidden', 'noext']:
+            assert cover_image_name(filename) == f"{Path(filename).stem}.png"
+    
+    def test_strips_directories(self):
+        """Test a slash in the name never produces a subdirectory."""
+        assert cover_image_name('AC/DC Game') == 'DC Game.png'
+
+
+class TestWriteGamelistXml:
+    """Tests for write_gamelist_xml function."""
+    
+    def test_write_round_trips_through_parser(self):
+        """Test that written games can be read back by parse_existing_gamelist."""
+        roms = [
+            {'id': 1, 'name': 'Super Mario World', 'fs_name': 'smw.sfc', 'url_cover': 'http://x/1.png'},
+            {'id': 2, 'name': 'Zelda & Friends', 'fs_name': 'zelda.sfc'},
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gamelist_path = Path(tmpdir) / 'gamelist.xml'
+            write_gamelist_xml(roms, 'snes', 'snes', gamelist_path)
+            
+            result = parse_existing_gamelist(gamelist_path)
+            
+            assert len(result) == 2
+            assert result['Super Mario World']['path'] == './smw.sfc'
+            assert result['Super Mario World']['image'].endswith('/snes/smw.png')
+            assert result['Zelda & Friends']['path'] == './zelda.sfc'
+            assert 'image' not in result['Zelda & Friends']
+    
+    def test_write_metadata_fields(self):
+        """Test rating, players and kid game fields are written."""
+        roms = [
+            {
+                'id': 7,
+                'name': 'Co-op Game',
+                'fs_name': 'coop.zip',
+                'first_release_date': '1991-08-23T00:00:00Z',
+                'igdb_metadata': {'total_rating': 85, 'game_modes': ['Co-operative']},
+            },
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gamelist_path = Path(tmpdir) / 'gamelist.xml'
+            write_gamelist_xml(roms, 'snes', 'snes', gamelist_path, kid_friendly_rom_ids={7})
+            
+            game = ET.parse(gamelist_path).getroot().find('game')
+            
+            assert game.findtext('rating') == '0.85'
+            assert game.findtext('releasedate') == '19910823T000000'
+            assert game.findtext('players') == '4'
+            assert game.findtext('kidgame') == 'true'
+    
+    def test_write_layout(self):
+        """Test the exact indented layout, which must not depend on the XML backend."""
+        roms = [{'id': 1, 'name': 'Game', 'fs_name': 'game.nes', 'summary': 'Fun'}]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gamelist_path = Path(tmpdir) / 'gamelist.xml'
+            write_gamelist_xml(roms, 'nes', 'nes', gamelist_path)
+            
+            assert gamelist_path.read_text() == (
+                '<?xml version="1.0" ?>\n'
+                '<gameList>\n'
+                '  <game>\n'
+                '    <path>./game.nes</path>\n'
+                '    <name>Game</name>\n'
+                '    <desc>Fun</desc>\n'
+                '  </game>\n'
+                '</gameList>\n'
+            )
+    
+    def test_failed_write_keeps_previous_gamelist(self, monkeypatch):
+        """Test an error mid-write leaves the old gamelist and no temp file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gamelist_path = Path(tmpdir) / 'gamelist.xml'
+            write_gamelist_xml([{'id': 1, 'name': 'Old', 'fs_name': 'old.nes'}], 'nes', 'nes', gamelist_path)
+            
+            build_game_element = romm_sync._build_game_element
+            
+            def failing_build(rom, *args):
+                if rom['id'] == 3:
+                    raise RuntimeError("boom")
+                return build_game_element(rom, *args)
+            
+            monkeypatch.setattr(romm_sync, '_build_game_element', failing_build)
+            new_roms = [{'id': 2, 'name': 'New', 'fs_name': 'new.nes'}, {'id': 3, 'name': 'Bad', 'fs_name': 'bad.nes'}]
+            with pytest.raises(RuntimeError):
+                write_gamelist_xml(new_roms, 'nes', 'nes', gamelist_path)
+            
+            assert list(parse_existing_gamelist(gamelist_path)) == ['Old']
+            assert [p.name for p in Path(tmpdir).iterdir()] == ['gamelist.xml']
+    
+    def test_concurrent_writes_to_one_gamelist(self):
+        """Test two writers of the same gamelist don't clash over the temp file."""
+        roms = [{'id': i, 'name': f'Game {i}', 'fs_name': f'game{i}.nes'} for i in range(2000)]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gamelist_path = Path(tmpdir) / 'gamelist.xml'
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [executor.submit(write_gamelist_xml, roms, 'nes', 'nes', gamelist_path) for _ in range(2)]
+                for future in futures:
+                    future.result()
+            
+            assert len(parse_existing_gamelist(gamelist_path)) == 2000
+            assert [p.name for p in Path(tmpdir).iterdir()] == ['gamelist.xml']
+    
+    def test_write_absolute_rom_paths(self):
+        """Test ROM paths use the base path when one is given."""
+        roms = [{'id': 1, 'name': 'Game', 'fs_name': 'game.nes'}]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gamelist_path = Path(tmpdir) / 'gamelist.xml'
+            write_gamelist_xml(roms, 'nes', 'nes', gamelist_path, rom_base_path='/romm/roms')
+            
+            result = parse_existing_gamelist(gamelist_path)
+            assert result['Game']['path'] == '/romm/roms/nes/game.nes'
+    
+    def test_write_strips_invalid_xml_characters(self):
+        """Test control characters in RomM text do not break the gamelist."""
+        roms = [{'id': 1, 'name': 'Game\x0b', 'fs_name': 'game.nes', 'summary': 'Line\x01 one'}]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gamelist_path = Path(tmpdir) / 'gamelist.xml'
+            write_gamelist_xml(roms, 'nes', 'nes', gamelist_path)
+            
+            game = ET.parse(gamelist_path).getroot().find('game')
+            assert game.findtext('name') == 'Game'
+            assert game.findtext('desc') == 'Line one'
+    
+    def test_write_strips_invalid_characters_from_all_fields(self):
+        """Test control characters in file names and IGDB lists are removed too."""
+        roms = [{
+            'id': 1,
+            'name': 'Game',
+            'fs_name': 'ga\x01me.nes',
+            'path_cover_s': '/cover',
+            'genres': ['Action\x02'],
+            'igdb_metadata': {'developers': ['Dev\x03'], 'publishers': ['Pub\x04']},
+        }]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gamelist_path = Path(tmpdir) / 'gamelist.xml'
+            write_gamelist_xml(roms, 'nes', 'nes', gamelist_path)
+            
+            game = ET.parse(gamelist_path).getroot().find('game')
+            assert game.findtext('path') == './game.nes'
+            assert game.findtext('image').endswith('/nes/game.png')
+            assert game.findtext('genre') == 'Action'
+            assert game.findtext('developer') == 'Dev'
+            assert game.findtext('publisher') == 'Pub'
+    
+    def test_write_null_name(self):
+        """Test a ROM with a null name is written with an empty <name/>."""
+        roms = [{'id': 3, 'name': None, 'fs_name': 'x.nes'}]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gamelist_path = Path(tmpdir) / 'gamelist.xml'
+            write_gamelist_xml(roms, 'nes', 'nes', gamelist_path)
+            
+            game = ET.parse(gamelist_path).getroot().find('game')
+            assert game.findtext('path') == './x.nes'
+            assert game.find('name') is not None
+            assert not game.findtext('name')
+    
+    def test_write_null_name_without_file_name(self):
+        """Test a ROM with neither a file name nor a name is still written."""
+        roms = [{'id': 4, 'name': None, 'path_cover_s': '/cover'}]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gamelist_path = Path(tmpdir) / 'gamelist.xml'
+            write_gamelist_xml(roms, 'nes', 'nes', gamelist_path)
+            
+            game = ET.parse(gamelist_path).getroot().find('game')
+            assert game.findtext('path') == './None'
+            assert game.findtext('image').endswith('/nes/Unknown.png')
+    
+    def test_write_honours_umask(self, monkeypatch):
+        """Test the gamelist gets the mode a plain open() would give it."""
+        monkeypatch.setattr(romm_sync, 'FILE_UMASK', 0o027)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gamelist_path = Path(tmpdir) / 'gamelist.xml'
+            write_gamelist_xml([{'id': 1, 'name': 'Game', 'fs_name': 'game.nes'}], 'nes', 'nes', gamelist_path)
+            
+            assert gamelist_path.stat().st_mode & 0o777 == 0o640
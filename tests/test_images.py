@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Unit tests for cover image downloads and selection in sync_platform.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import romm_sync
+from romm_sync import CoverManifest, RomMClient, download_image, sync_platform
+
+from fakes import ConditionalSession
+
+
+PLATFORM = {"id": 10, "slug": "nes", "name": "NES"}
+
+
+def make_target(tmp_path):
+    """Target config that keeps images and ROMs under tmp_path."""
+    return {
+        "name": "Test",
+        "gamelist_path": str(tmp_path / "gamelists"),
+        "images_path": str(tmp_path / "images"),
+        "roms_path": str(tmp_path / "roms"),
+        "image_subdir": "",
+    }
+
+
+def run_sync(tmp_path, monkeypatch, roms, changed=True, **kwargs):
+    """Run sync_platform with download_image replaced; return the downloads made."""
+    calls = []
+    
+    def fake_download_image(client, rom, dest_path, etag=None, conditional=True, request_limiter=None):
+        calls.append((rom["id"], dest_path.name, etag, conditional))
+        dest_path.write_bytes(b"png")
+        return ('"etag"', changed)
+    
+    monkeypatch.setattr(romm_sync, "download_image", fake_download_image)
+    client = RomMClient("http://romm.local", "user", "password")
+    sync_platform(
+        client, PLATFORM, tmp_path / "gamelists", roms=roms,
+        target_config=make_target(tmp_path), kid_friendly_rom_ids=frozenset(), **kwargs
+    )
+    return calls
+
+
+class TestDownloadImage:
+    """Tests for download_image."""
+    
+    ROM = {"id": 1, "name": "Game", "path_cover_s": "/cover"}
+    
+    def make_client(self, session):
+        client = RomMClient("http://romm.local", "user", "password")
+        client.cover_session = session
+        return client
+    
+    def test_missing_image_is_downloaded(self, tmp_path):
+        """Test a missing cover is fetched without conditional headers."""
+        session = ConditionalSession()
+        dest = tmp_path / "game.png"
+        
+        assert download_image(self.make_client(session), self.ROM, dest) == ('"v1"', True)
+        
+        assert dest.read_bytes() == b"new cover"
+        assert session.headers == [{}]
+        assert [p.name for p in tmp_path.iterdir()] == ["game.png"]
+    
+    def test_unchanged_image_returns_304(self, tmp_path):
+        """Test an existing cover is re-checked conditionally and left alone on 304."""
+        session = ConditionalSession()
+        dest = tmp_path / "game.png"
+        dest.write_bytes(b"old cover")
+        
+        assert download_image(self.make_client(session), self.ROM, dest, etag='"v1"') == ('"v1"', False)
+        
+        assert dest.read_bytes() == b"old cover"
+        assert session.headers[0]["If-None-Match"] == '"v1"'
+        assert "If-Modified-Since" in session.headers[0]
+    
+    def test_unconditional_download_replaces_image(self, tmp_path):
+        """Test conditional=False always fetches the cover (its source changed)."""
+        session = ConditionalSession()
+        dest = tmp_path / "game.png"
+        dest.write_bytes(b"old cover")
+        
+        assert download_image(self.make_client(session), self.ROM, dest, etag='"v1"', conditional=False) == ('"v1"', True)
+        
+        assert dest.read_bytes() == b"new cover"
+        assert session.headers == [{}]
+
+
+    def test_server_errors_are_retried_through_the_limiter(self, tmp_path, monkeypatch):
+        """Test every retry of a failing cover takes a token from the request limiter."""
+        monkeypatch.setattr(romm_sync.time, "sleep", lambda seconds: None)
+        session = ConditionalSession(status=503)
+        limiter = CountingLimiter()
+        
+        result = download_image(self.make_client(session), self.ROM, tmp_path / "game.png", request_limiter=limiter)
+        
+        assert result is None
+        assert len(session.headers) == 3
+        assert limiter.consumed == 3
+    
+    def test_cover_sessions_do_not_retry(self):
+        """Test the adapters used for covers leave retries to download_image."""
+        client = RomMClient("http://romm.local", "user", "password")
+        
+        for session in (client.cover_session, client.external_session):
+            assert session.get_adapter("https://example.com").max_retries.total == 0
+
+
+class CountingLimiter:
+    """Stand-in for TokenBucket that counts the tokens taken."""
+    
+    def __init__(self):
+        self.consumed = 0
+    
+    def consume(self, amount=1):
+        self.consumed += amount
+
+
+class TestCoverSelection:
+    """Tests for choosing which covers sync_platform downloads."""
+    
+    def test_shared_cover_name_downloaded_once(self, tmp_path, monkeypatch):
+        """Test ROMs whose covers share a file name don't download it twice."""
+        roms = [
+            {"id": 1, "name": "Game", "fs_name": "game.zip", "path_cover_s": "/a"},
+            {"id": 2, "name": "Game", "fs_name": "game.7z", "path_cover_s": "/b"},
+        ]
+        
+        calls = run_sync(tmp_path, monkeypatch, roms)
+        
+        assert [(rom_id, name) for rom_id, name, _, _ in calls] == [(1, "game.png")]
+    
+    def test_existing_covers_are_skipped(self, tmp_path, monkeypatch):
+        """Test a cover already on disk with an unchanged source is not requested."""
+        images = tmp_path / "images" / "nes"
+        images.mkdir(parents=True)
+        (images / "game.png").write_bytes(b"png")
+        manifest = CoverManifest(tmp_path / "manifest.db")
+        manifest.record(str(images), [(1, "/a", '"v1"')])
+        roms = [{"id": 1, "name": "Game", "fs_name": "game.zip", "path_cover_s": "/a"}]
+        
+        assert run_sync(tmp_path, monkeypatch, roms, manifest=manifest) == []
+        manifest.close()
+    
+    def test_changed_source_is_downloaded_unconditionally(self, tmp_path, monkeypatch):
+        """Test a cover whose source changed in RomM is fetched again in full."""
+        images = tmp_path / "images" / "nes"
+        images.mkdir(parents=True)
+        (images / "game.png").write_bytes(b"png")
+        manifest = CoverManifest(tmp_path / "manifest.db")
+        manifest.record(str(images), [(1, "/old", '"v1"')])
+        roms = [{"id": 1, "name": "Game", "fs_name": "game.zip", "path_cover_s": "/new"}]
+        
+        calls = run_sync(tmp_path, monkeypatch, roms, manifest=manifest)
+        
+        assert calls == [(1, "game.png", '"v1"', False)]
+        assert manifest.load(str(images)) == {1: ("/new", '"etag"')}
+        manifest.close()
+    
+    def test_refresh_reports_unchanged_covers(self, tmp_path, monkeypatch, capsys):
+        """Test --refresh-images re-checks covers and counts 304s as unchanged."""
+        images = tmp_path / "images" / "nes"
+        images.mkdir(parents=True)
+        (images / "game.png").write_bytes(b"png")
+        manifest = CoverManifest(tmp_path / "manifest.db")
+        manifest.record(str(images), [(1, "/a", '"v1"')])
+        roms = [{"id": 1, "name": "Game", "fs_name": "game.zip", "path_cover_s": "/a"}]
+        
+        calls = run_sync(tmp_path, monkeypatch, roms, changed=False, manifest=manifest, refresh_images=True)
+        
+        assert calls == [(1, "game.png", '"v1"', True)]
+        assert "Downloaded 0 cover images (skipped 0 existing, 1 unchanged, 0 failed)" in capsys.readouterr().out
+        manifest.close()
+    
+    def test_stale_temp_files_are_removed(self, tmp_path, monkeypatch):
+        """Test .part files left by an interrupted run are cleaned up."""
+        images = tmp_path / "images" / "nes"
+        images.mkdir(parents=True)
+        (images / "game.png").write_bytes(b"png")
+        (images / "game.png.x1y2.part").write_bytes(b"pn")
+        roms = [{"id": 1, "name": "Game", "fs_name": "game.zip", "path_cover_s": "/a"}]
+        
+        run_sync(tmp_path, monkeypatch, roms)
+        
+        assert sorted(p.name for p in images.iterdir()) == ["game.png"]
+    
+    def test_cover_without_manifest_row_is_fetched_once(self, tmp_path, monkeypatch):
+        """Test a cover on disk with no manifest row is re-fetched in full, then tracked."""
+        images = tmp_path / "images" / "nes"
+        images.mkdir(parents=True)
+        (images / "game.png").write_bytes(b"old png")
+        manifest = CoverManifest(tmp_path / "manifest.db")
+        roms = [{"id": 1, "name": "Game", "fs_name": "game.zip", "path_cover_s": "/changed"}]
+        
+        calls = run_sync(tmp_path, monkeypatch, roms, manifest=manifest)
+        
+        assert calls == [(1, "game.png", None, False)]
+        assert manifest.load(str(images)) == {1: ("/changed", '"etag"')}
+        assert run_sync(tmp_path, monkeypatch, roms, manifest=manifest) == []
+        manifest.close()
+    
+    def test_shared_cover_name_not_refetched(self, tmp_path, monkeypatch):
+        """Test the second ROM sharing a cover name doesn't trigger downloads on later runs."""
+        roms = [
+            {"id": 1, "name": "Game", "fs_name": "game.zip", "path_cover_s": "/a"},
+            {"id": 2, "name": "Game", "fs_name": "game.7z", "path_cover_s": "/b"},
+        ]
+        manifest = CoverManifest(tmp_path / "manifest.db")
+        
+        assert len(run_sync(tmp_path, monkeypatch, roms, manifest=manifest)) == 1
+        assert run_sync(tmp_path, monkeypatch, roms, manifest=manifest) == []
+        manifest.close()
+    
+    def test_null_name_without_file_name(self, tmp_path, monkeypatch):
+        """Test a ROM with neither a file name nor a name gets a fallback cover name."""
+        roms = [{"id": 1, "name": None, "path_cover_s": "/a"}]
+        
+        calls = run_sync(tmp_path, monkeypatch, roms)
+        
+        assert [name for _, name, _, _ in calls] == ["Unknown.png"]
+    
+    def test_image_slots_cap_downloads_across_platforms(self, tmp_path, monkeypatch):
+        """Test platforms synced at once share the image_slots download cap."""
+        lock = threading.Lock()
+        active = []
+        peak = []
+        
+        def fake_download_image(client, rom, dest_path, etag=None, conditional=True, request_limiter=None):
+            with lock:
+                active.append(rom["id"])
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.remove(rom["id"])
+            dest_path.write_bytes(b"png")
+            return ('"etag"', True)
+        
+        monkeypatch.setattr(romm_sync, "download_image", fake_download_image)
+        client = RomMClient("http://romm.local", "user", "password")
+        slots = threading.BoundedSemaphore(2)
+        platforms = [{"id": 10, "slug": "nes", "name": "NES"}, {"id": 11, "slug": "snes", "name": "SNES"}]
+        
+        def sync(platform):
+            roms = [{"id": platform["id"] * 100 + i, "name": "Game", "fs_name": f"game{i}.zip", "path_cover_s": "/a"} for i in range(6)]
+            return sync_platform(
+                client, platform, tmp_path / "gamelists", roms=roms, target_config=make_target(tmp_path),
+                kid_friendly_rom_ids=frozenset(), image_workers=4, image_slots=slots,
+            )
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert list(executor.map(sync, platforms)) == [6, 6]
+        
+        assert len(peak) == 12
+        assert max(peak) <= 2
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the CoverManifest SQLite store.
+"""
+
+import tempfile
+from pathlib import Path
+from romm_sync import CoverManifest
+
+
+class TestCoverManifest:
+    """Tests for CoverManifest."""
+    
+    def test_record_and_load(self):
+        """Test recorded covers are returned per images directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = CoverManifest(Path(tmpdir) / 'state' / 'manifest.db')
+            manifest.record('/images/snes', [(1, 'http://x/1.png', '"a"'), (2, '/cover/2', '')])
+            manifest.record('/images/nes', [(1, '/cover/n1', '"b"')])
+            
+            assert manifest.load('/images/snes') == {1: ('http://x/1.png', '"a"'), 2: ('/cover/2', '')}
+            assert manifest.load('/images/nes') == {1: ('/cover/n1', '"b"')}
+            assert manifest.load('/images/gba') == {}
+            manifest.close()
+    
+    def test_record_replaces_existing_row(self):
+        """Test a re-downloaded cover overwrites its previous source and ETag."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / 'manifest.db'
+            manifest = CoverManifest(db_path)
+            manifest.record('/images/snes', [(1, 'old', '"a"')])
+            manifest.record('/images/snes', [(1, 'new', '"b"')])
+            manifest.close()
+            
+            reopened = CoverManifest(db_path)
+            assert reopened.load('/images/snes') == {1: ('new', '"b"')}
+            reopened.close()
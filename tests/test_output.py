@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ThreadOutput and progress output detection.
+"""
+
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from romm_sync import ProgressWriter, ThreadOutput, run_collected, stdout_is_interactive
+
+
+class FakeTerminal(io.StringIO):
+    """StringIO that claims to be a terminal."""
+
+    def isatty(self):
+        return True
+
+
+class TestThreadOutput:
+    """Tests for ThreadOutput."""
+    
+    def test_capture_buffers_output(self):
+        """Test output written while capturing is returned by release()."""
+        stream = io.StringIO()
+        output = ThreadOutput(stream)
+        
+        output.capture()
+        output.write("buffered\n")
+        text = output.release()
+        output.write("direct\n")
+        
+        assert text == "buffered\n"
+        assert stream.getvalue() == "direct\n"
+    
+    def test_worker_output_is_collected(self, monkeypatch):
+        """Test run_collected returns a worker's output instead of printing it."""
+        stream = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", ThreadOutput(stream))
+        
+        def work():
+            print("  Warning: something went wrong")
+            return 5
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(run_collected, work).result()
+        
+        assert result == (5, "  Warning: something went wrong\n")
+        assert stream.getvalue() == ""
+    
+    def test_not_interactive_while_capturing(self, monkeypatch):
+        """Test buffered output is never treated as a terminal."""
+        output = ThreadOutput(FakeTerminal())
+        monkeypatch.setattr(sys, "stdout", output)
+        
+        assert stdout_is_interactive()
+        output.capture()
+        assert not stdout_is_interactive()
+        output.release()
+        assert stdout_is_interactive()
+    
+    def test_redirected_output_not_interactive(self, monkeypatch):
+        """Test a plain stream is not treated as a terminal."""
+        monkeypatch.setattr(sys, "stdout", io.StringIO())
+        
+        assert not stdout_is_interactive()
+
+
+class TestProgressWriter:
+    """Tests for ProgressWriter output."""
+    
+    def test_terminal_progress_redraws_line(self, monkeypatch):
+        """Test progress on a terminal is redrawn in place."""
+        stdout = FakeTerminal()
+        monkeypatch.setattr(sys, "stdout", stdout)
+        
+        writer = ProgressWriter(io.BytesIO(), total_size=4)
+        writer.write(b"data")
+        writer.report()
+        
+        assert stdout.getvalue().startswith("\r      Progress: 100.0%")
+        assert "\n" not in stdout.getvalue()
+    
+    def test_piped_progress_prints_lines(self, monkeypatch):
+        """Test piped progress is printed as whole lines without carriage returns."""
+        stdout = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", stdout)
+        
+        writer = ProgressWriter(io.BytesIO(), total_size=4, interactive=False)
+        writer.write(b"data")
+        writer.report()
+        
+        lines = stdout.getvalue().splitlines()
+        assert "\r" not in stdout.getvalue()
+        assert lines and lines[-1].startswith("      Progress: 100.0%")
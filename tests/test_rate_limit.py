@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the TokenBucket rate limiter.
+"""
+
+import romm_sync
+from romm_sync import TokenBucket
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+    
+    def test_burst_does_not_wait(self, monkeypatch):
+        """Test consuming up to the capacity returns immediately."""
+        sleeps = []
+        monkeypatch.setattr(romm_sync.time, "sleep", sleeps.append)
+        
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.consume(10)
+        
+        assert sleeps == []
+    
+    def test_waits_for_missing_tokens(self, monkeypatch):
+        """Test consuming past the capacity sleeps for the deficit."""
+        sleeps = []
+        monkeypatch.setattr(romm_sync.time, "sleep", sleeps.append)
+        monkeypatch.setattr(romm_sync.time, "monotonic", lambda: 0.0)
+        
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.consume(10)
+        bucket.consume(50)
+        
+        assert sleeps == [0.5]
+    
+    def test_refills_over_time(self, monkeypatch):
+        """Test tokens come back at the configured rate."""
+        now = [0.0]
+        sleeps = []
+        monkeypatch.setattr(romm_sync.time, "sleep", sleeps.append)
+        monkeypatch.setattr(romm_sync.time, "monotonic", lambda: now[0])
+        
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.consume(10)
+        now[0] = 0.1
+        bucket.consume(10)
+        
+        assert sleeps == []
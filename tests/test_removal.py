@@ -243,3 +243,21 @@ class TestRemoveUnfavoritedGames:
             
             assert removed_roms == 0
             assert removed_images == 0
+    
+    def test_remove_with_missing_directories(self):
+        """Test removing games when the ROM and image directories don't exist."""
+        current_roms = []
+        existing_games = {
+            'Game 1': {'path': './game1.sfc', 'image': 'image1.png'},
+        }
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            roms_path = Path(tmpdir) / 'roms'
+            images_path = Path(tmpdir) / 'images'
+            
+            removed_roms, removed_images = remove_unfavorited_games(
+                current_roms, existing_games, roms_path, images_path, dry_run=False
+            )
+            
+            assert removed_roms == 0
+            assert removed_images == 0